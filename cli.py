@@ -4,12 +4,16 @@ GitMentor CLI - Professional Version
 Extended with History Tracking, AI Explanation, and Commit Documentation
 """
 import click
-import subprocess
 import os
-from rich.console import Console
+from types import SimpleNamespace
+from src.utils.console import console
 from rich.panel import Panel
 
-console = Console()
+
+def _run_main(command, **options):
+    """Dispatch a command to main.py's executors in this process."""
+    from main import _dispatch
+    _dispatch(SimpleNamespace(command=command, **options))
 
 @click.group()
 def cli():
@@ -26,22 +30,14 @@ def cli():
 def commit(intent):
     """Generate Conventional Commit + detailed tracking documentation"""
     # Check for staged changes first
-    result = subprocess.run(
-        ['git', 'diff', '--cached', '--quiet'],
-        capture_output=True
-    )
+    from main import _cached_git_ops
     
-    if result.returncode == 0:
+    if not _cached_git_ops(os.getcwd()).has_staged_changes():
         console.print("[red]❌ No staged changes found[/red]")
         console.print("[yellow]Hint: Use 'git add <files>' to stage changes first[/yellow]")
         return
     
-    # Pass to main.py logic
-    cmd = ['python', 'main.py', 'commit']
-    if intent:
-        cmd.extend(['--intent', intent])
-    
-    subprocess.run(cmd)
+    _run_main('commit', intent=intent, target_branch='main')
 
 
 @cli.command()
@@ -49,23 +45,20 @@ def commit(intent):
 @click.option('--intent', '-m', help='PR overarching intent')
 def pr(target, intent):
     """Generate high-quality PR documentation using commit tracking history"""
-    cmd = ['python', 'main.py', 'pr', '--target-branch', target]
-    if intent:
-        cmd.extend(['--intent', intent])
-    subprocess.run(cmd)
+    _run_main('pr', intent=intent, target_branch=target)
 
 
 @cli.command()
 def docs():
     """Generate technical 'System Blueprint' documentation (CODE_DOCS.md)"""
-    subprocess.run(['python', 'main.py', 'docs'])
+    _run_main('docs', intent=None, target_branch='main')
 
 
 @cli.command()
 @click.option('--target', '-t', default='main', help='Comparison branch')
 def audit(target):
     """Run professional quality and security audit (Steward)"""
-    subprocess.run(['python', 'main.py', 'audit', '--target-branch', target])
+    _run_main('audit', intent=None, target_branch=target)
 
 
 @cli.command()
@@ -73,10 +66,7 @@ def audit(target):
 @click.option('--intent', '-m', help='Release/Project intent')
 def full(target, intent):
     """Run full analysis swarm and sync README with codebase reality"""
-    cmd = ['python', 'main.py', 'full', '--target-branch', target]
-    if intent:
-        cmd.extend(['--intent', intent])
-    subprocess.run(cmd)
+    _run_main('full', intent=intent, target_branch=target)
 
 
 @cli.command()
@@ -89,13 +79,12 @@ def full(target, intent):
 def branch(intent, type, no_commit):
     """Create a semantically named branch based on intent"""
     # Using python directly to leverage the BranchManager tool
-    from src.tools.gitops import GitOps
+    from main import _cached_git_ops
     from src.tools.branch_manager import BranchManager
     
     console.print(Panel("🌿 [bold green]GitMentor: Smart Branch Creator[/bold green]", border_style="green"))
     
-    git_ops = GitOps(os.getcwd())
-    manager = BranchManager(git_ops)
+    manager = BranchManager(_cached_git_ops(os.getcwd()))
     
     with console.status("[bold yellow]AI is determining branch strategy...[/bold yellow]"):
         try:
@@ -127,11 +116,10 @@ def branch(intent, type, no_commit):
 
 @cli.command(name='search-history')
 @click.argument('query', nargs=-1, required=True)
-def search_history(query):
+@click.option('--no-cache', is_flag=True, help='Ignore cached history and rescan')
+def search_history(query, no_cache):
     """Search git history for specific logic or variable evolutions"""
-    query_text = ' '.join(query)
-    # Forward to main.py routing
-    subprocess.run(['python', 'main.py', 'search-history'] + list(query))
+    _run_main('search-history', query=list(query), no_cache=no_cache)
 
 
 @cli.command()
@@ -146,17 +134,24 @@ def search_history(query):
               default='auto')
 def explain(name, level, file, type):
     """Get a high-level or deep-dive AI explanation of code"""
-    cmd = ['python', 'main.py', 'explain', name, '--level', level, '--type', type]
-    if file:
-        cmd.extend(['--file', file])
-    subprocess.run(cmd)
+    _run_main('explain', name=name, level=level, file=file, type=type)
 
 
 @cli.command()
 @click.argument('query', nargs=-1, required=True)
-def where(query):
+@click.option('--no-cache', is_flag=True, help='Ignore cached query extraction and search results')
+def where(query, no_cache):
     """Find code locations using natural language queries"""
-    subprocess.run(['python', 'main.py', 'where'] + list(query))
+    _run_main('where', query=list(query), no_cache=no_cache)
+
+
+@cli.command()
+@click.option('--detach', is_flag=True, help='Run the daemon in the background')
+@click.option('--stop', is_flag=True, help='Stop a running daemon')
+def daemon(detach, stop):
+    """Keep a warm GitMentor process serving commands over a Unix socket"""
+    from main import _handle_daemon
+    _handle_daemon(SimpleNamespace(detach=detach, stop=stop))
 
 
 if __name__ == '__main__':
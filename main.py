@@ -1,29 +1,64 @@
 # main.py - GitMentor Autonomous Code Steward
 import os
+import sys
 import argparse
 import subprocess
 import json
 import re
 import textwrap
+import hashlib
+import heapq
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from dotenv import load_dotenv
 
-from src.graph import app
 from src.utils.config import cfg
 from src.tools.gitops import GitOps
-from src.tools.branch_manager import BranchManager
 
-from rich.console import Console
+from src.utils.console import console
 from rich.panel import Panel
 from rich.table import Table
 from rich.rule import Rule
+from rich.live import Live
 from rich.prompt import Prompt
 from rich.syntax import Syntax
 from rich.markdown import Markdown
 
-console = Console()
 load_dotenv()
 
-def main():
+# ========================================================================
+# LAZY SINGLETONS
+# ========================================================================
+# Built on first use and reused, so repeated commands in one process
+# (the daemon, or test loops) skip client and repository construction.
+
+def _cached_llm(profile):
+    from src.utils.llm import get_llm  # Cached per profile by get_llm itself
+    return get_llm(profile)
+
+@lru_cache(maxsize=4)
+def _cached_git_ops(repo_path):
+    return GitOps(repo_path)
+
+@lru_cache(maxsize=4)
+def _cached_analyzer(repo_path):
+    from src.tools.history import HistoryAnalyzer
+    return HistoryAnalyzer(_cached_git_ops(repo_path))
+
+@lru_cache(maxsize=4)
+def _cached_explainer(repo_path):
+    from src.agents.explainer import CodeExplainer
+    return CodeExplainer(repo_path)
+
+WHERE_KIND_PRIORITY = {"function": 0, "class": 1, "file": 2, "keyword": 3}
+WHERE_ROWS = 10
+HISTORY_ROWS = 10
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+_PRECISE_QUERY_RE = re.compile(r'[A-Za-z_][\w./*]*')
+
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="GitMentor - Autonomous Code Steward",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -66,6 +101,7 @@ Examples:
     # --- SEARCH HISTORY COMMAND ---
     search_parser = subparsers.add_parser('search-history', help='Search git history for variable/logic changes')
     search_parser.add_argument('query', nargs='+', help='Query (e.g., "var_name in file.py")')
+    search_parser.add_argument('--no-cache', action='store_true', help='Ignore cached history and rescan')
 
     # --- EXPLAIN COMMAND ---
     explain_parser = subparsers.add_parser('explain', help='AI-powered explanation of code blocks')
@@ -77,13 +113,41 @@ Examples:
     # --- WHERE COMMAND ---
     where_parser = subparsers.add_parser('where', help='Find code location using natural language')
     where_parser.add_argument('query', nargs='+', help='Search query')
+    where_parser.add_argument('--no-cache', action='store_true', help='Ignore cached query extraction and search results')
+
+    # --- DAEMON COMMAND ---
+    daemon_parser = subparsers.add_parser('daemon', help='Keep a warm GitMentor process serving CLI commands')
+    daemon_parser.add_argument('--detach', action='store_true', help='Run the daemon in the background')
+    daemon_parser.add_argument('--stop', action='store_true', help='Stop a running daemon')
+
+    return parser
 
-    args = parser.parse_args()
+
+def main(argv=None):
+    parser = _build_parser()
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
         return
 
+    if args.command == 'daemon':
+        _handle_daemon(args)
+        return
+
+    # Forward to a warm daemon when one is running; interactive commands stay local
+    interactive = args.command == 'commit' and not args.intent
+    if not interactive and not os.getenv("GITMENTOR_NO_DAEMON"):
+        from src.utils import daemon
+        status = daemon.forward(sys.argv[1:] if argv is None else list(argv))
+        if status is not None:
+            sys.exit(status)
+
+    _dispatch(args)
+
+
+def _dispatch(args):
+    """Run a parsed command in the current process."""
     # Header
     console.print(Panel(
         f"[bold blue]{cfg.get('project.name', 'GITMENTOR').upper()}[/bold blue] | {args.command.upper()} ENGINE",
@@ -109,7 +173,7 @@ Examples:
         return
 
     # Initialize Git for remaining commands
-    git_ops = GitOps(os.getcwd())
+    git_ops = _cached_git_ops(os.getcwd())
     current_branch = git_ops.get_current_branch()
     target_branch = getattr(args, 'target_branch', 'main')
     user_intent = getattr(args, 'intent', None)
@@ -126,52 +190,77 @@ Examples:
 # ========================================================================
 
 def _execute_search_history(args):
-    from src.tools.history import HistoryAnalyzer
-    query_text = ' '.join(args.query)
-    parts = query_text.split(' in ')
-    search_term = parts[0].strip()
-    file_path = parts[1].strip() if len(parts) > 1 else None
+    search_term, file_path = _split_query(' '.join(args.query))
     
-    git_ops = GitOps(os.getcwd())
-    analyzer = HistoryAnalyzer(git_ops)
+    from src.tools.history_cache import HistoryCache
+    history = HistoryCache(_cached_analyzer(os.getcwd()), refresh=getattr(args, 'no_cache', False))
     
-    with console.status(f"[dim]Analyzing history for '{search_term}'..."):
-        changes = analyzer.track_variable_changes(search_term, file_path, max_commits=100)
-        current_value = analyzer.get_current_value(search_term, file_path) if file_path else None
-
-    if not changes:
+    # Group changes by commit and keep only the newest commits in a bounded heap
+    groups = {}
+    latest = []
+    with Live(_history_table(search_term, [], caption="Scanning history..."),
+              console=console, refresh_per_second=4, transient=True) as live:
+        for seq, change in enumerate(history.iter_variable_changes(search_term, file_path, max_commits=100)):
+            commit_hash = change['commit_hash']
+            if commit_hash in groups:
+                groups[commit_hash].append(change)
+                if all(e[2] != commit_hash for e in latest):
+                    continue
+            else:
+                groups[commit_hash] = [change]
+                entry = (change['commit_date'], seq, commit_hash)
+                if len(latest) < HISTORY_ROWS:
+                    heapq.heappush(latest, entry)
+                elif entry > latest[0]:
+                    heapq.heapreplace(latest, entry)
+                else:
+                    continue
+            live.update(_history_table(search_term, [groups[e[2]] for e in sorted(latest)], caption="Scanning history..."))
+
+    if not latest:
         console.print(f"\n[yellow]No history found for '{search_term}'[/yellow]")
         return
 
-    table = Table(title=f"History of '{search_term}'", show_header=True, header_style="bold cyan")
+    console.print(_history_table(search_term, [groups[e[2]] for e in sorted(latest)]))
+
+def _split_query(query_text):
+    """Split 'term in path/to/file.py' into (term, file_path or None)."""
+    parts = query_text.split(' in ')
+    return parts[0].strip(), parts[1].strip() if len(parts) > 1 else None
+
+def _history_table(search_term, commits, caption=None):
+    """One row per commit; extra matching lines in that commit are summarised."""
+    table = Table(title=f"History of '{search_term}'", caption=caption, show_header=True, header_style="bold cyan")
     table.add_column("Date", style="dim")
     table.add_column("Commit", style="yellow")
     table.add_column("Author", style="green")
     table.add_column("Value", style="cyan")
     
-    changes.sort(key=lambda x: x['commit_date'])
-    for change in changes[-10:]:
+    for changes in commits:
+        first = changes[0]
+        value = first['value'][:50] + "..." if len(first['value']) > 50 else first['value']
+        if len(changes) > 1:
+            value += f" [dim](+{len(changes) - 1} more)[/dim]"
         table.add_row(
-            change['commit_date'].strftime("%Y-%m-%d %H:%M"),
-            change['commit_hash'],
-            change['author'],
-            change['value'][:50] + "..." if len(change['value']) > 50 else change['value']
+            first['commit_date'].strftime("%Y-%m-%d %H:%M"),
+            first['commit_hash'],
+            first['author'],
+            value
         )
-    console.print(table)
+    return table
 
 def _execute_explain(args):
-    from src.agents.explainer import CodeExplainer
-    explainer = CodeExplainer(os.getcwd())
+    explainer = _cached_explainer(os.getcwd())
     
     with console.status(f"[dim]Analyzing '{args.name}'..."):
         if args.type == 'auto':
-            result = explainer.explain_function(args.name, args.level, args.file)
+            result = explainer.explain_function_stream(args.name, args.level, args.file)
             if not result['success']:
-                result = explainer.explain_class(args.name, args.level, args.file)
+                result = explainer.explain_class_stream(args.name, args.level, args.file)
         elif args.type == 'function':
-            result = explainer.explain_function(args.name, args.level, args.file)
+            result = explainer.explain_function_stream(args.name, args.level, args.file)
         else:
-            result = explainer.explain_class(args.name, args.level, args.file)
+            result = explainer.explain_class_stream(args.name, args.level, args.file)
 
     if not result['success']:
         console.print(f"\n[red]Error: {result['error']}[/red]")
@@ -179,46 +268,130 @@ def _execute_explain(args):
 
     syntax = Syntax(result['source_code'], "python", theme="monokai", line_numbers=True)
     console.print(Panel(syntax, title="Source Code", border_style="dim"))
-    console.print(Markdown(result['explanation']))
+    _render_markdown_stream(result['explanation_chunks'])
+
+def _render_markdown_stream(chunks, refresh_per_second=8):
+    """
+    Render streamed Markdown progressively. Parsing the buffer is the costly
+    part, so it is re-parsed at most once per refresh tick, plus once at the end.
+    """
+    buffer = ""
+    rendered_length = 0
+    interval = 1 / refresh_per_second
+    last_render = 0.0
+    # Default overflow while streaming; Live.stop() renders the full text once at the end
+    with Live(Markdown(""), console=console, refresh_per_second=refresh_per_second) as live:
+        for chunk in chunks:
+            buffer += chunk
+            now = time.monotonic()
+            if now - last_render >= interval:
+                live.update(Markdown(buffer))
+                rendered_length, last_render = len(buffer), now
+        if len(buffer) != rendered_length:
+            live.update(Markdown(buffer))
 
 def _execute_where(args):
-    from src.tools.history import HistoryAnalyzer
-    from src.utils.llm import get_llm
-    from langchain_core.messages import SystemMessage, HumanMessage
-    
+    from src.tools.history_cache import HistoryCache
     query_text = ' '.join(args.query)
-    git_ops = GitOps(os.getcwd())
-    analyzer = HistoryAnalyzer(git_ops)
-    llm = get_llm("default")
+    use_cache = not getattr(args, 'no_cache', False)
+    history = HistoryCache(_cached_analyzer(os.getcwd()), refresh=not use_cache)
+    search_params = _extract_search_params(query_text, use_cache=use_cache)
     
-    extraction_prompt = textwrap.dedent(f"""
-        Extract search terms from: "{query_text}"
-        Return ONLY JSON: {{"identifiers": [], "file_patterns": [], "keywords": []}}
-    """)
-    
-    response = llm.invoke([SystemMessage(content="Code search assistant"), HumanMessage(content=extraction_prompt)])
-    json_match = re.search(r'\{.*\}', response.content, re.DOTALL)
-    search_params = json.loads(json_match.group(0)) if json_match else {{"identifiers": [query_text]}}
-    
-    all_results = []
-    with console.status("[dim]Searching..."):
-        for iden in search_params.get('identifiers', []):
-            all_results.extend(analyzer.find_function_definition(iden))
-            all_results.extend(analyzer.find_class_definition(iden))
-
+    identifiers = search_params.get('identifiers', [])
+    file_patterns = search_params.get('file_patterns', [])
+    keywords = search_params.get('keywords', [])
+
+    # Each lookup is an independent read-only scan, so fan them out.
+    # Results are keyed by location so overlapping searches show one row each.
+    by_location = {}
+    with Live(_where_table([], caption="Searching..."), console=console, refresh_per_second=4, transient=True) as live:
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
+            # One pass over the tree resolves every identifier as function or class
+            futures = {executor.submit(history.call, "find_definitions_bulk", tuple(sorted(set(identifiers)))): None}
+            futures.update({executor.submit(history.call, "find_files", p): "file" for p in file_patterns})
+            futures.update({executor.submit(history.call, "search_files_for_pattern", re.escape(k), ".py", k): "keyword" for k in keywords})
+            for future in as_completed(futures):
+                if futures[future] is None:
+                    for results in future.result().values():
+                        _merge_results(by_location, results)
+                else:
+                    _merge_results(by_location, future.result(), futures[future])
+                live.update(_where_table(list(by_location.values())[:WHERE_ROWS], caption="Searching..."))
+
+    all_results = list(by_location.values())
     if not all_results:
         console.print("[yellow]No matches found.[/yellow]")
         return
 
-    table = Table(title="Search Results")
+    # Definitions outrank keyword hits regardless of completion order
+    all_results.sort(key=lambda r: WHERE_KIND_PRIORITY[r['kind']])
+    console.print(_where_table(all_results[:WHERE_ROWS]))
+
+def _where_table(results, caption=None):
+    table = Table(title="Search Results", caption=caption)
     table.add_column("Location", style="cyan")
     table.add_column("Line", style="dim")
+    table.add_column("Kind", style="magenta")
     table.add_column("Match")
-    for res in all_results[:10]:
-        table.add_row(res['file'], str(res['line_number']), res['matched_line'][:60])
-    console.print(table)
+    for res in results:
+        table.add_row(res['file'], str(res['line_number'] or ''), res['kind'], res['matched_line'][:60])
+    return table
+
+_EXTRACTION_PROMPT = textwrap.dedent("""
+        Extract search terms from: "{query_text}"
+        Return ONLY JSON: {{"identifiers": [], "file_patterns": [], "keywords": []}}
+    """)
+
+def _extract_search_params(query_text, use_cache=True):
+    """Ask the LLM to turn a query into search terms, memoized on disk per model."""
+    # A bare identifier or file name is already a search term
+    if _PRECISE_QUERY_RE.fullmatch(query_text):
+        is_path = any(c in query_text for c in './*')
+        return {
+            "identifiers": [] if '.' in query_text else [query_text],
+            "file_patterns": [query_text] if is_path else [],
+            "keywords": []
+        }
+
+    model = cfg.get("llm.default.model")
+    key = hashlib.sha1(f"{model}:{query_text}".encode("utf-8")).hexdigest()
+    cache_path = Path(cfg.get("paths.cache")).expanduser() / "where_extract" / f"{key}.json"
+
+    if use_cache and cache_path.exists():
+        try:
+            return json.loads(cache_path.read_text(encoding="utf-8"))
+        except ValueError:
+            pass  # Corrupt entry, fall through and refresh it
+
+    from langchain_core.messages import SystemMessage, HumanMessage
+    llm = _cached_llm("default")
+
+    extraction_prompt = _EXTRACTION_PROMPT.format(
+        query_text=query_text
+    )
+
+    response = llm.invoke([SystemMessage(content="Code search assistant"), HumanMessage(content=extraction_prompt)])
+    json_match = _JSON_OBJECT_RE.search(response.content)
+    if not json_match:
+        return {"identifiers": [query_text]}
+
+    search_params = json.loads(json_match.group(0))
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(search_params), encoding="utf-8")
+    return search_params
+
+def _merge_results(by_location, results, kind=None):
+    """Add results keyed by (file, line), keeping the highest-priority kind per line."""
+    for res in results:
+        if kind:
+            res['kind'] = kind
+        key = (res['file'], res['line_number'])
+        current = by_location.get(key)
+        if current is None or WHERE_KIND_PRIORITY[res['kind']] < WHERE_KIND_PRIORITY[current['kind']]:
+            by_location[key] = res
 
 def _execute_graph_mode(args, current_branch, target_branch, user_intent):
+    from src.graph import app
     initial_state = {
         "repo_path": os.getcwd(), "target_branch": target_branch, "source_branch": current_branch,
         "mode": args.command, "intent": user_intent, "artifacts": [], "messages": [], "code_issues": []
@@ -227,10 +400,11 @@ def _execute_graph_mode(args, current_branch, target_branch, user_intent):
     
     final_state = initial_state
     with console.status(f"[dim]Processing {args.command} nodes...", spinner="dots"):
+        # Parallel nodes (Architect + Steward) may report in the same event
         for event in app.stream(initial_state):
-            node_name = list(event.keys())[0]
-            final_state = event[node_name]
-            _render_node_summary(node_name, final_state)
+            for node_name, update in event.items():
+                final_state = update or {}
+                _render_node_summary(node_name, final_state)
     
     if args.command == "full": _update_readme_with_analysis(final_state)
     if args.command in ["pr", "full"]: _handle_pr_output(final_state, target_branch)
@@ -246,7 +420,7 @@ def _execute_commit_mode(args):
 
 def _update_readme_with_analysis(state):
     from src.agents.scribe import _generate_enhanced_readme
-    git_ops = GitOps(os.getcwd())
+    git_ops = _cached_git_ops(os.getcwd())
     new_content = _generate_enhanced_readme(git_ops, state)
     if new_content:
         with open("README.md", "w") as f: f.write(new_content)
@@ -262,9 +436,70 @@ def _render_node_summary(node_name: str, state: dict):
     if content:
         console.print(Panel("\n".join(content), title=f"Agent: {node_name.capitalize()}", border_style="dim"))
 
+def _handle_daemon(args):
+    from src.utils import daemon
+    if not daemon.is_supported():
+        console.print("[red]Error:[/red] The daemon requires Unix domain socket support.")
+        return
+
+    if args.stop:
+        if daemon.shutdown():
+            console.print("[green]Daemon stopped.[/green]")
+        else:
+            console.print("[yellow]No daemon is running.[/yellow]")
+        return
+
+    if daemon.is_running():
+        console.print(f"[yellow]A daemon is already serving on[/yellow] [dim]{daemon.SOCKET_PATH}[/dim]")
+        return
+
+    if args.detach:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), 'daemon'],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        console.print(f"[green]Daemon started on[/green] [dim]{daemon.SOCKET_PATH}[/dim]")
+        return
+
+    # Pay the heavy imports once so forwarded commands start warm
+    import src.graph  # noqa: F401
+    import src.tools.branch_manager  # noqa: F401
+
+    global _warm_env
+    _warm_env = _warm_env_key()
+    console.print(f"[green]Serving GitMentor commands on[/green] [dim]{daemon.SOCKET_PATH}[/dim]")
+    if not daemon.serve(_dispatch_forwarded):
+        console.print(f"[yellow]A daemon is already serving on[/yellow] [dim]{daemon.SOCKET_PATH}[/dim]")
+
+# Environment the daemon's config and LLM clients were built from
+_WARM_ENV_KEYS = ("GOOGLE_API_KEY", "OPENAI_API_KEY", "ANTHROPIC_API_KEY")
+_warm_env = None
+
+def _warm_env_key():
+    config_path = os.getenv("CONFIG_PATH")
+    return (os.path.abspath(os.path.expanduser(config_path)) if config_path else None,
+            *(os.getenv(key) for key in _WARM_ENV_KEYS))
+
+def _dispatch_forwarded(argv):
+    """
+    Daemon handler, run in the caller's directory and environment. Config and
+    LLM clients are rebuilt when the caller's settings differ from the ones
+    they were built with.
+    """
+    global _warm_env
+    env_key = _warm_env_key()
+    if env_key != _warm_env:
+        from src.utils.llm import get_llm
+        cfg._load_config()
+        get_llm.cache_clear()
+        _cached_explainer.cache_clear()
+        _warm_env = env_key
+    _dispatch(_build_parser().parse_args(argv))
+
 def _handle_branch_creation(args):
-    git_ops = GitOps(os.getcwd())
-    manager = BranchManager(git_ops)
+    from src.tools.branch_manager import BranchManager
+    manager = BranchManager(_cached_git_ops(os.getcwd()))
     try:
         name, btype = manager.create_smart_branch(user_intent=args.intent, auto_detect_type=(args.type is None), suggested_type=args.type, create_initial_commit=(not args.no_commit))
         console.print(Panel(f"Branch: [cyan]{name}[/cyan]\nType: [yellow]{btype}[/yellow]", title="Success", border_style="green"))
@@ -275,7 +510,7 @@ def _handle_commit_output(state):
         console.print(Panel("Apply using: [bold]git commit -F COMMIT_MESSAGE.txt[/bold]", title="Success", border_style="green"))
 
 def _handle_pr_output(state, target_branch):
-    git_ops = GitOps(os.getcwd())
+    git_ops = _cached_git_ops(os.getcwd())
     current = git_ops.get_current_branch()
     console.print(Panel(f"gh pr create --base {target_branch} --head {current} --body-file PR_Document.md", title="Deployment", border_style="green"))
 
@@ -1,18 +1,15 @@
 # src/agents/architect.py
-import os
 from datetime import datetime
-from rich.console import Console
+from src.utils.console import console
 from langchain_core.messages import HumanMessage
 
 from src.state import RepoState
 from src.tools.parser import PythonCodeParser
 from src.tools.diagram import MermaidGenerator
-from src.tools.gitops import GitOps
+from src.utils.repo_index import RepoFileIndex
 from src.utils.workspace import save_artifact
 from src.utils.config import cfg
 
-console = Console()
-
 def architect_node(state: RepoState) -> RepoState:
     """
     The Visual Architect Agent.
@@ -23,20 +20,12 @@ def architect_node(state: RepoState) -> RepoState:
     
     # 1. Setup and Tool Initialization
     repo_path = state.get("repo_path", cfg.get("paths.repo_root"))
-    git_ops = GitOps(repo_path)
     parser = PythonCodeParser(repo_path)
     viz = MermaidGenerator(parser)
     
     # Gather all tracked Python files to ensure the graph isn't empty
-    try:
-        py_files = git_ops.repo.git.ls_files("*.py").splitlines()
-    except Exception:
-        # Fallback to manual walk if git fails
-        py_files = []
-        for root, _, files in os.walk(repo_path):
-            for file in files:
-                if file.endswith(".py"):
-                    py_files.append(os.path.relpath(os.path.join(root, file), repo_path))
+    # (the shared index falls back to a directory walk outside git or if git fails)
+    py_files = RepoFileIndex.get(repo_path).files(".py")
 
     new_artifacts = []
     
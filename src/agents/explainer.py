@@ -3,47 +3,111 @@ src/agents/explainer.py - AI-powered Code Explainer Agent
 """
 import os
 import ast
+import json
+import hashlib
 import textwrap
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
 from src.utils.llm import get_llm
+from src.utils.config import cfg
+from src.utils.repo_index import RepoFileIndex
 from langchain_core.messages import SystemMessage, HumanMessage
 
+_EXPLAIN_PROMPT = textwrap.dedent("""
+            You are an expert software architect. Explain the following Python {context_type} 
+            to someone at a '{level}' expertise level.
+            
+            Expertise Level Definitions:
+            - beginner: Focus on high-level purpose, basic logic, and simple analogies. Avoid jargon.
+            - medium: Explain the flow, key dependencies, and technical implementation details.
+            - hard: Deep dive into architectural decisions, performance implications, and edge cases.
+
+            Source Code:
+            ```python
+            {source}
+            ```
+
+            Provide a structured explanation using Markdown. Include:
+            1. **Purpose**: What does this {context_type} do?
+            2. **Logic Breakdown**: How does it work?
+            3. **Key Components**: Notable variables or logic blocks.
+        """)
+
 class CodeExplainer:
     def __init__(self, repo_path: str):
         self.repo_path = repo_path
         self.llm = get_llm("default")
+        self._file_index = RepoFileIndex.get(repo_path)
+        # file_path -> ((mtime_ns, size), parsed file dict or None), see _parse_file
+        self._ast_cache: Dict[str, tuple] = {}
+        # Repo-wide (node_type_name, name) -> [file_path, ...], see _symbol_index
+        self._symbol_files: Optional[Dict[str, list]] = None
+        self._symbol_lookup: Dict[tuple, List[str]] = {}
+
+        repo_hash = hashlib.sha1(os.path.abspath(repo_path).encode("utf-8")).hexdigest()[:16]
+        self._index_path = Path(cfg.get("paths.cache")).expanduser() / "explainer" / f"{repo_hash}.json"
 
     def _find_node_in_file(self, file_path: str, name: str, node_type: ast.AST) -> Optional[tuple]:
         """Search a specific file for a function or class definition."""
+        parsed = self._parse_file(file_path, must_contain=name)
+        if parsed is None:
+            return None
+
+        span = parsed["definitions"].get((node_type.__name__, name))
+        if span is None:
+            return None
+
+        # Split the file only once a definition is confirmed, then keep the lines
+        if parsed["lines"] is None:
+            parsed["lines"] = parsed["source"].splitlines()
+
+        # Extract the source lines for this specific node
+        start_line, end_line = span
+        return "\n".join(parsed["lines"][start_line - 1:end_line]), start_line
+
+    def _parse_file(self, file_path: str, must_contain: Optional[str] = None) -> Optional[dict]:
+        """
+        Returns {"source", "definitions", "lines"} for a file, where definitions
+        maps (node_type_name, name) to (lineno, end_lineno) and lines is filled
+        in lazily. The parse is reused while the file's mtime and size are unchanged.
+        With `must_contain`, an uncached file whose text lacks that substring
+        returns None without being parsed.
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._ast_cache.get(file_path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 source = f.read()
-            
+            if must_contain and must_contain not in source:
+                return None  # Not cached: the answer depends on the needle
             tree = ast.parse(source)
-            for node in ast.walk(tree):
-                if isinstance(node, node_type) and node.name == name:
-                    # Extract the source lines for this specific node
-                    lines = source.splitlines()
-                    start_line = node.lineno - 1
-                    end_line = node.end_lineno
-                    node_source = "\n".join(lines[start_line:end_line])
-                    return node_source, node.lineno
         except Exception:
-            return None
-        return None
+            parsed = None
+        else:
+            # Breadth-first like ast.walk, so the first definition found wins as before
+            definitions = {}
+            for node in _iter_definitions(tree):
+                definitions.setdefault((type(node).__name__, node.name), (node.lineno, node.end_lineno))
+            parsed = {"source": source, "definitions": definitions, "lines": None}
+
+        self._ast_cache[file_path] = (stamp, parsed)
+        return parsed
 
     def _search_codebase(self, name: str, node_type: ast.AST, specific_file: Optional[str] = None) -> Optional[dict]:
         """Scan the directory for the target definition."""
-        files_to_scan = []
         if specific_file:
-            files_to_scan.append(os.path.join(self.repo_path, specific_file))
+            files_to_scan = [os.path.join(self.repo_path, specific_file)]
         else:
-            for root, _, files in os.walk(self.repo_path):
-                if "venv" in root or ".git" in root:
-                    continue
-                for file in files:
-                    if file.endswith(".py"):
-                        files_to_scan.append(os.path.join(root, file))
+            files_to_scan = self._symbol_index().get((node_type.__name__, name), [])
 
         for file_path in files_to_scan:
             result = self._find_node_in_file(file_path, name, node_type)
@@ -76,31 +140,127 @@ class CodeExplainer:
         data["explanation"] = self._generate_ai_explanation(data["source_code"], "class", level)
         return data
 
+    def explain_function_stream(self, name: str, level: str = "medium", file_path: Optional[str] = None) -> Dict:
+        """
+        Finds a function and attaches `explanation_chunks`, an iterator of text
+        fragments from the LLM, so callers can show the source right away.
+        """
+        data = self._search_codebase(name, ast.FunctionDef, file_path)
+        if data["success"]:
+            data["explanation_chunks"] = self._stream_ai_explanation(data["source_code"], "function", level)
+        return data
+
+    def explain_class_stream(self, name: str, level: str = "medium", file_path: Optional[str] = None) -> Dict:
+        """Streaming counterpart of explain_class."""
+        data = self._search_codebase(name, ast.ClassDef, file_path)
+        if data["success"]:
+            data["explanation_chunks"] = self._stream_ai_explanation(data["source_code"], "class", level)
+        return data
+
     def _generate_ai_explanation(self, source: str, context_type: str, level: str) -> str:
         """Calls the LLM to explain the code snippet."""
-        prompt = textwrap.dedent(f"""
-            You are an expert software architect. Explain the following Python {context_type} 
-            to someone at a '{level}' expertise level.
-            
-            Expertise Level Definitions:
-            - beginner: Focus on high-level purpose, basic logic, and simple analogies. Avoid jargon.
-            - medium: Explain the flow, key dependencies, and technical implementation details.
-            - hard: Deep dive into architectural decisions, performance implications, and edge cases.
+        response = self.llm.invoke(self._explanation_messages(source, context_type, level))
+        return response.content
 
-            Source Code:
-            ```python
-            {source}
-            ```
+    def _stream_ai_explanation(self, source: str, context_type: str, level: str) -> Iterator[str]:
+        """Yields the explanation as the LLM produces it."""
+        for chunk in self.llm.stream(self._explanation_messages(source, context_type, level)):
+            if isinstance(chunk.content, str) and chunk.content:
+                yield chunk.content
 
-            Provide a structured explanation using Markdown. Include:
-            1. **Purpose**: What does this {context_type} do?
-            2. **Logic Breakdown**: How does it work?
-            3. **Key Components**: Notable variables or logic blocks.
-        """)
+    def _explanation_messages(self, source: str, context_type: str, level: str) -> List:
+        prompt = _EXPLAIN_PROMPT.format(
+            context_type=context_type,
+            level=level,
+            source=source
+        )
 
-        response = self.llm.invoke([
+        return [
             SystemMessage(content="You are a helpful technical documentation assistant."),
             HumanMessage(content=prompt)
-        ])
-        
-        return response.content
\ No newline at end of file
+        ]
+
+    def _symbol_index(self) -> Dict[tuple, List[str]]:
+        """
+        Map (node_type_name, name) to the files defining it, in walk order.
+
+        Per-file definition names are persisted under <paths.cache>/explainer/
+        with each file's (mtime_ns, size), so only files changed since the
+        last run are parsed again, including on a cold start.
+        """
+        if self._symbol_files is None:
+            self._symbol_files = self._load_symbol_files()
+
+        files = {}
+        stale = []
+        for file_path in self._iter_python_files():
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                continue
+            stamp = [st.st_mtime_ns, st.st_size]
+            entry = self._symbol_files.get(file_path)
+            if entry is None or entry[0] != stamp:
+                stale.append(file_path)
+                entry = [stamp, []]
+            files[file_path] = entry
+
+        # Reads overlap across threads; only changed files are parsed at all
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(len(stale), os.cpu_count() or 4)) as executor:
+                for file_path, parsed in zip(stale, executor.map(self._parse_file, stale)):
+                    files[file_path][1] = [list(key) for key in parsed["definitions"]] if parsed else []
+        changed = bool(stale)
+
+        if changed or len(files) != len(self._symbol_files) or not self._symbol_lookup:
+            self._symbol_files = files
+            self._symbol_lookup = {}
+            for file_path, (_, names) in files.items():
+                for node_type_name, name in names:
+                    self._symbol_lookup.setdefault((node_type_name, name), []).append(file_path)
+            self._store_symbol_files()
+        return self._symbol_lookup
+
+    def _load_symbol_files(self) -> Dict[str, list]:
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _store_symbol_files(self) -> None:
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._index_path, "w", encoding="utf-8") as f:
+                json.dump(self._symbol_files, f)
+        except OSError:
+            pass  # The index is only an accelerator
+
+    def _iter_python_files(self) -> Iterator[str]:
+        """
+        Yield the repo's .py files, untracked ones included, from the shared
+        RepoFileIndex, so a listing already made by another agent is reused.
+        """
+        for rel_path in self._file_index.files(".py", include_untracked=True):
+            yield os.path.join(self.repo_path, rel_path)
+
+def _iter_definitions(tree: ast.Module) -> Iterator[ast.AST]:
+    """
+    Yield module-level functions and classes plus class members, breadth-first.
+    Function bodies and expressions are never entered; if/try/with blocks at
+    module or class level are, since conditional definitions live there.
+    """
+    pending = list(tree.body)
+    for node in pending:  # Appending while iterating keeps breadth-first order
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            yield node
+        if isinstance(node, ast.ClassDef):
+            pending.extend(node.body)
+        elif isinstance(node, ast.If):
+            pending.extend(node.body + node.orelse)
+        elif isinstance(node, ast.Try):
+            pending.extend(node.body + node.orelse + node.finalbody)
+            for handler in node.handlers:
+                pending.extend(handler.body)
+        elif isinstance(node, ast.With):
+            pending.extend(node.body)
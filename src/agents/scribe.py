@@ -3,22 +3,45 @@ import os
 import json
 import textwrap
 import re
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 from langchain_core.messages import SystemMessage, HumanMessage
 from src.state import RepoState
 from src.tools.gitops import GitOps
+from src.tools import git_fast
 from src.utils.llm import get_llm
+from src.utils.llm_cache import cached_invoke
 from src.utils.workspace import save_artifact
 from src.utils.config import cfg
-from rich.console import Console
-
-console = Console()
+from src.utils.console import console
+from src.utils.repo_index import RepoFileIndex
 
 # Constants
 COMMIT_DOCS_DIR = ".gitworkspace/commit_docs"
 COMMIT_INDEX_FILE = ".gitworkspace/commit_index.json"
 
+# LLM output cleanup, compiled once
+_MD_FENCE_START = re.compile(r'^```(?:markdown|md)?\n')
+_ANY_FENCE_START = re.compile(r'^```[\w]*\n')
+_FENCE_END = re.compile(r'\n```$')
+_FENCE_END_LOOSE = re.compile(r'\n```\s*$')
+_FIRST_HEADER = re.compile(r'^#+\s', re.MULTILINE)
+_DIFF_FILE_SPLIT = re.compile(r'^(?=diff --git )', re.MULTILINE)
+
+# Diff sections that cost tokens without telling the LLM anything useful
+NOISE_DIFF_FILES = {
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock",
+    "Pipfile.lock", "uv.lock", "Cargo.lock", "composer.lock",
+}
+_PREAMBLE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in (
+        r'^(?:Here\'?s|Here is|I\'?ve created|I\'?ve generated|Below is).*?(?:\n|:)\s*',
+        r'^(?:Let me|I will|I can).*?(?:\n|:)\s*',
+        r'^.*?(?:Pull Request|PR documentation).*?(?:\n|:)\s*'
+    )
+]
+
 def scribe_node(state: RepoState) -> RepoState:
     """
     The Contextual Scribe generates:
@@ -73,43 +96,23 @@ def _ensure_commit_docs_dir(repo_path: str):
             json.dump({"commits": []}, f)
 
 
-def _save_commit_documentation(repo_path: str, commit_hash: str, commit_data: dict) -> str:
-    """
-    Save detailed commit documentation to .gitworkspace/commit_docs/
-    
-    Args:
-        repo_path: Repository root path
-        commit_hash: Short commit hash (7 chars)
-        commit_data: Dictionary containing commit details
-    
-    Returns:
-        Path to saved markdown file
-    """
-    docs_dir = Path(repo_path) / COMMIT_DOCS_DIR
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{timestamp}_{commit_hash}.md"
-    filepath = docs_dir / filename
-    
-    # Generate detailed commit documentation
-    llm = get_llm("creative")
-    
-    prompt = textwrap.dedent(f"""
+_COMMIT_DOC_PROMPT = textwrap.dedent("""
     You are a Senior Software Engineer documenting a code commit for future PR generation.
     
     COMMIT CONTEXT:
-    Hash: {commit_data.get('hash', commit_hash)}
-    Author: {commit_data.get('author', 'Unknown')}
-    Date: {commit_data.get('date', 'Unknown')}
-    Message: {commit_data.get('subject', 'No message')}
+    Hash: {hash}
+    Author: {author}
+    Date: {date}
+    Message: {subject}
     
     Files Changed:
-    {commit_data.get('files_changed', 'No files listed')}
+    {files_changed}
     
     Diff Preview:
-    {commit_data.get('diff_preview', 'No diff available')}
+    {diff_preview}
     
     Code Quality Issues Addressed:
-    {commit_data.get('issues_fixed', 'None reported')}
+    {issues_fixed}
     
     REQUIREMENTS:
     Generate a detailed technical document that explains:
@@ -121,11 +124,11 @@ def _save_commit_documentation(repo_path: str, commit_hash: str, commit_data: di
     
     OUTPUT FORMAT (Pure Markdown, NO code fences):
     
-    # Commit: {commit_data.get('subject', 'Commit Documentation')}
+    # Commit: {title}
     
     **Hash:** `{commit_hash}`  
-    **Author:** {commit_data.get('author', 'Unknown')}  
-    **Date:** {commit_data.get('date', 'Unknown')}
+    **Author:** {author}  
+    **Date:** {date}
     
     ## Changes Overview
     [High-level summary in 2-3 sentences]
@@ -157,16 +160,48 @@ def _save_commit_documentation(repo_path: str, commit_hash: str, commit_data: di
     
     CRITICAL: Output ONLY the markdown content. NO preambles, NO code fences wrapping the entire response.
     """)
+
+def _save_commit_documentation(repo_path: str, commit_hash: str, commit_data: dict) -> str:
+    """
+    Save detailed commit documentation to .gitworkspace/commit_docs/
+    
+    Args:
+        repo_path: Repository root path
+        commit_hash: Short commit hash (7 chars)
+        commit_data: Dictionary containing commit details
+    
+    Returns:
+        Path to saved markdown file
+    """
+    docs_dir = Path(repo_path) / COMMIT_DOCS_DIR
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{timestamp}_{commit_hash}.md"
+    filepath = docs_dir / filename
     
-    response = llm.invoke([
+    # Generate detailed commit documentation
+    llm = get_llm("creative")
+    
+    prompt = _COMMIT_DOC_PROMPT.format(
+        hash=commit_data.get('hash', commit_hash),
+        author=commit_data.get('author', 'Unknown'),
+        date=commit_data.get('date', 'Unknown'),
+        subject=commit_data.get('subject', 'No message'),
+        files_changed=commit_data.get('files_changed', 'No files listed'),
+        diff_preview=commit_data.get('diff_preview', 'No diff available'),
+        issues_fixed=commit_data.get('issues_fixed', 'None reported'),
+        title=commit_data.get('subject', 'Commit Documentation'),
+        commit_hash=commit_hash
+    )
+    
+    response_text = cached_invoke(llm, "creative", [
         SystemMessage(content="You are a technical documentation expert. Output pure markdown only."),
         HumanMessage(content=prompt)
     ])
     
     # Clean the response
-    clean_content = response.content.strip()
-    clean_content = re.sub(r'^```(?:markdown|md)?\n', '', clean_content)
-    clean_content = re.sub(r'\n```$', '', clean_content)
+    clean_content = response_text.strip()
+    clean_content = _MD_FENCE_START.sub('', clean_content)
+    clean_content = _FENCE_END.sub('', clean_content)
     
     # Save to file
     with open(filepath, 'w') as f:
@@ -261,6 +296,21 @@ def _cleanup_commit_docs(repo_path: str):
 # SYSTEM DOCUMENTATION GENERATION
 # ============================================================================
 
+_SYSTEM_DOCS_PROMPT = textwrap.dedent("""
+        You are a Principal Software Architect. Your goal is to write a "System Blueprint" document.
+        
+        Analyze the following technical context:
+        {detailed_context}
+        
+        Requirements:
+        1. Executive Summary: Explain the "Why" behind this system.
+        2. Component Analysis: Describe the interaction between high-level modules.
+        3. Implementation Detail: Summarize the logic found in key files.
+        4. Operational Flow: How does data move through this system?
+        
+        Tone: Highly technical, objective, and authoritative.
+    """)
+
 def _generate_system_documentation(git_ops: GitOps, state: RepoState) -> list:
     """Generates comprehensive technical documentation for the entire codebase."""
     console.print("    [yellow]Mode: System Documentation Generation[/yellow]")
@@ -272,16 +322,23 @@ def _generate_system_documentation(git_ops: GitOps, state: RepoState) -> list:
     parser = PythonCodeParser(repo_path)
     architect = MermaidGenerator(parser)
     
-    py_files = git_ops.repo.git.ls_files("*.py").splitlines()
+    py_files = RepoFileIndex.get(repo_path).files(".py")
     console.print(f"    Analyzing {len(py_files)} modules for system overview...")
     
     dep_graph = architect.generate_architecture_map(py_files)
     complexity_map = architect.generate_complexity_heatmap()
     
+    # Only a bounded slice is described to the LLM
+    max_context_files = cfg.get("scribe.max_context_files", 15)
+    context_files = py_files[:max_context_files]
+    if len(py_files) > max_context_files:
+        console.print(f"    [dim]Describing the first {max_context_files} of {len(py_files)} modules to the LLM[/dim]")
+    
     detailed_context = ""
-    for file_path in py_files[:15]: 
+    for file_path in context_files: 
         try:
-            analysis = parser.analyze_file(file_path)
+            # The architecture map above already analyzed these files
+            analysis = parser.file_analyses.get(file_path) or parser.analyze_file(file_path)
             if analysis.classes or analysis.functions:
                 detailed_context += f"\n### File: {file_path}\n"
                 for cls in analysis.classes:
@@ -293,27 +350,16 @@ def _generate_system_documentation(git_ops: GitOps, state: RepoState) -> list:
             continue
 
     llm = get_llm("creative")
-    prompt = textwrap.dedent(f"""
-        You are a Principal Software Architect. Your goal is to write a "System Blueprint" document.
-        
-        Analyze the following technical context:
-        {detailed_context}
-        
-        Requirements:
-        1. Executive Summary: Explain the "Why" behind this system.
-        2. Component Analysis: Describe the interaction between high-level modules.
-        3. Implementation Detail: Summarize the logic found in key files.
-        4. Operational Flow: How does data move through this system?
-        
-        Tone: Highly technical, objective, and authoritative.
-    """)
+    prompt = _SYSTEM_DOCS_PROMPT.format(
+        detailed_context=detailed_context
+    )
     
-    response = llm.invoke([
+    response_text = cached_invoke(llm, "creative", [
         SystemMessage(content="You are a Technical Lead writing high-level system documentation."),
         HumanMessage(content=prompt)
     ])
     
-    full_docs = f"# System Documentation\n\n{response.content}\n\n"
+    full_docs = f"# System Documentation\n\n{response_text}\n\n"
     
     if dep_graph:
         full_docs += f"## System Architecture Map\n```mermaid\n{dep_graph}\n```\n\n"
@@ -358,8 +404,7 @@ def _generate_commit_message(git_ops: GitOps, state: RepoState) -> list:
         return []
     
     try:
-        staged_files = git_ops.repo.git.diff("--cached", name_only=True).split('\n')
-        staged_files = [f.strip() for f in staged_files if f.strip()]
+        staged_files = git_fast.staged_files(git_ops.repo_path)
         console.print(f"    Analyzing {len(staged_files)} staged file(s)")
     except Exception:
         staged_files = []
@@ -386,13 +431,12 @@ def _generate_commit_message(git_ops: GitOps, state: RepoState) -> list:
         temp_hash = datetime.now().strftime("%Y%m%d%H%M%S")[:7]
         
         # Prepare detailed commit data for documentation
-        diff_preview = diff[:2000] + "\n... [truncated]" if len(diff) > 2000 else diff
+        diff_preview = _sample_diff(diff, head=1400, tail=600)
         
         issues_fixed = ""
         if code_issues:
-            critical = [i for i in code_issues if i.get("severity") == "critical"]
-            high = [i for i in code_issues if i.get("severity") == "high"]
-            issues_fixed = f"Critical: {len(critical)}, High: {len(high)}"
+            severity = Counter(i.get("severity") for i in code_issues)
+            issues_fixed = f"Critical: {severity['critical']}, High: {severity['high']}"
         
         commit_data = {
             "hash": temp_hash,
@@ -427,22 +471,7 @@ def _generate_commit_message(git_ops: GitOps, state: RepoState) -> list:
         return []
 
 
-def _generate_commit_with_llm(diff: str, files: list, user_intent: str, code_issues: list) -> str:
-    llm = get_llm("creative")
-
-    diff_snippet = diff[:3000] + "\n... [truncated]" if len(diff) > 3000 else diff
-
-    issues_context = ""
-    if code_issues:
-        critical = len([i for i in code_issues if i.get("severity") == "critical"])
-        warnings = len([i for i in code_issues if i.get("severity") == "warning"])
-        issues_context = (
-            f"\nCode Quality Context:\n"
-            f"- Critical issues addressed: {critical}\n"
-            f"- Warnings addressed: {warnings}\n"
-        )
-
-    prompt = textwrap.dedent(f"""
+_COMMIT_MESSAGE_PROMPT = textwrap.dedent("""
     You are a senior software engineer writing a high-quality Conventional Commit message.
 
     AVAILABLE CONTEXT:
@@ -450,7 +479,7 @@ def _generate_commit_with_llm(diff: str, files: list, user_intent: str, code_iss
     {user_intent}
 
     Changed Files (use to infer scope, not to list verbatim):
-    {', '.join(files[:10])}
+    {files}
 
     {issues_context}
 
@@ -480,20 +509,80 @@ def _generate_commit_with_llm(diff: str, files: list, user_intent: str, code_iss
     - Assume this commit will be read months later with no additional context.
     """)
 
-    response = llm.invoke([
+def _generate_commit_with_llm(diff: str, files: list, user_intent: str, code_issues: list) -> str:
+    llm = get_llm("creative")
+
+    diff_snippet = _sample_diff(diff, head=2000, tail=1000)
+
+    issues_context = ""
+    if code_issues:
+        severity = Counter(i.get("severity") for i in code_issues)
+        critical, warnings = severity["critical"], severity["warning"]
+        issues_context = (
+            f"\nCode Quality Context:\n"
+            f"- Critical issues addressed: {critical}\n"
+            f"- Warnings addressed: {warnings}\n"
+        )
+
+    prompt = _COMMIT_MESSAGE_PROMPT.format(
+        user_intent=user_intent,
+        files=', '.join(files[:10]),
+        issues_context=issues_context,
+        diff_snippet=diff_snippet
+    )
+
+    response_text = cached_invoke(llm, "creative", [
         SystemMessage(content="You write precise, conventional, production-quality commit messages."),
         HumanMessage(content=prompt)
     ])
 
-    msg = response.content.strip()
+    msg = response_text.strip()
 
     # Safety cleanup in case the model still emits fences
-    msg = re.sub(r'^```[\w]*\n', '', msg)
-    msg = re.sub(r'\n```$', '', msg)
+    msg = _ANY_FENCE_START.sub('', msg)
+    msg = _FENCE_END.sub('', msg)
 
     return msg.strip()
 
 
+def _sample_diff(diff: str, head: int = 2000, tail: int = 1000) -> str:
+    """
+    Shrink a diff for the LLM: drop lockfile and binary sections, then keep the
+    first `head` and last `tail` characters, preferring file boundaries as cut
+    points so both the first and the last changed files stay readable.
+    """
+    sections = [
+        section for section in _DIFF_FILE_SPLIT.split(diff)
+        if section and not _is_noise_section(section)
+    ]
+    diff = "".join(sections)
+    if len(diff) <= head + tail:
+        return diff
+
+    # File boundary, else line boundary, else a hard cut (e.g. minified one-liners)
+    head_end = diff.rfind("\ndiff --git ", 0, head)
+    if head_end < head // 2:
+        head_end = diff.rfind("\n", 0, head)
+    if head_end < head // 2:
+        head_end = head
+    tail_floor = len(diff) - tail
+    tail_start = diff.find("\ndiff --git ", tail_floor)
+    if tail_start == -1 or tail_start > tail_floor + tail // 2:
+        tail_start = diff.find("\n", tail_floor)
+    if tail_start == -1 or tail_start > tail_floor + tail // 2:
+        tail_start = tail_floor
+
+    skipped = tail_start - head_end
+    return f"{diff[:head_end]}\n... [truncated {skipped} chars] ...{diff[tail_start:]}"
+
+
+def _is_noise_section(section: str) -> bool:
+    header = section.split("\n", 1)[0]
+    if header.startswith("diff --git ") and os.path.basename(header.rsplit(" b/", 1)[-1]) in NOISE_DIFF_FILES:
+        return True
+    return "\nBinary files " in section[:500]
+
+
 # ============================================================================
 # PR DOCUMENTATION GENERATION
 # ============================================================================
@@ -503,12 +592,11 @@ def _generate_pr_documentation(git_ops: GitOps, state: RepoState, target_branch:
     
     repo_path = state.get("repo_path", os.getcwd())
     
-    commits, actual_target = _get_commits_since(git_ops, target_branch)
-    if not commits:
+    commits_data, actual_target = _get_commits_since(git_ops, target_branch)
+    if not commits_data:
         console.print("    [red]Warning:[/red] No commits found to document.")
         return []
     
-    commits_data = [_get_commit_details(git_ops, c) for c in commits]
     source_branch = git_ops.get_current_branch()
     
     # Load all detailed commit documentation
@@ -537,64 +625,47 @@ def _generate_pr_documentation(git_ops: GitOps, state: RepoState, target_branch:
         "id": "pr_document",
         "type": "markdown_doc",
         "file_path": pr_path,
-        "description": f"PR Documentation ({len(commits)} commits)",
+        "description": f"PR Documentation ({len(commits_data)} commits)",
         "created_by": "scribe"
     }]
 
 
 def _get_commits_since(git_ops: GitOps, base_branch: str):
+    """Details for every commit in base..HEAD, read with a single `git log --stat`."""
     try:
         target = base_branch if _branch_exists(git_ops, base_branch) else f"origin/{base_branch}"
-        commits = git_ops.repo.git.log(f"{target}..HEAD", pretty="format:%H").splitlines()
-        return commits, target
+        limit = cfg.get("scribe.max_pr_commits", 200)
+        output = git_fast.run_git(
+            git_ops.repo_path, "log", f"{target}..HEAD", f"--max-count={limit}", "--stat", "--color=never",
+            "--date=format:%Y-%m-%d %H:%M", "--pretty=format:%x00%H%x1f%an%x1f%ad%x1f%s"
+        )
+        return _parse_commit_log(output), target
     except Exception:
         return [], base_branch
 
 
-def _branch_exists(git_ops: GitOps, branch: str) -> bool:
-    try:
-        git_ops.repo.git.rev_parse("--verify", branch)
-        return True
-    except Exception:
-        return False
+def _parse_commit_log(output: str) -> list:
+    """Split NUL-separated `git log --stat` records into commit detail dicts."""
+    commits = []
+    for record in output.split("\x00")[1:]:
+        header, _, stat = record.partition("\n")
+        full_hash, author, date, subject = header.split("\x1f", 3)
+        stat = stat.strip("\n")
+        commits.append({
+            "hash": full_hash[:7],
+            "author": author,
+            "date": date,
+            "subject": subject,
+            "stats": f"{full_hash[:7]} {subject}\n{stat}".rstrip()
+        })
+    return commits
 
 
-def _get_commit_details(git_ops: GitOps, commit_hash: str) -> dict:
-    repo = git_ops.repo
-    commit = repo.commit(commit_hash)
-    stats = repo.git.show("--stat", commit_hash, "--oneline")
-    preview = repo.git.show(commit_hash, color="never").split('\n')[5:20]
-    
-    return {
-        "hash": commit.hexsha[:7],
-        "author": commit.author.name,
-        "date": commit.authored_datetime.strftime("%Y-%m-%d %H:%M"),
-        "subject": commit.message.split('\n')[0],
-        "stats": stats,
-        "preview": '\n'.join(preview)
-    }
+def _branch_exists(git_ops: GitOps, branch: str) -> bool:
+    return git_fast.ref_exists(git_ops.repo_path, branch)
 
-def _generate_enhanced_readme(git_ops: GitOps, state: RepoState) -> str:
-    """Uses LLM to rewrite the README based on codebase reality and architecture."""
-    console.print("    [yellow]Mode: AI README Transformation[/yellow]")
-    
-    current_readme = ""
-    if os.path.exists("README.md"):
-        with open("README.md", "r") as f:
-            current_readme = f.read()
-            
-    # Gather architectural context from previous nodes
-    arch_context = ""
-    for art in state.get("artifacts", []):
-        if "architecture_overview" in art.get("id", "") or "architecture" in art.get("file_path", ""):
-            try:
-                with open(art["file_path"], "r") as f:
-                    arch_context += f"\n{f.read()}"
-            except Exception:
-                continue
 
-    llm = get_llm("creative")
-    prompt = textwrap.dedent(f"""
+_README_PROMPT = textwrap.dedent("""
         You are a Principal Developer Advocate. Your task is to transform the project README.md 
         into a world-class documentation hub based on the latest architectural analysis.
         
@@ -605,7 +676,7 @@ def _generate_enhanced_readme(git_ops: GitOps, state: RepoState) -> str:
         {arch_context}
         
         RECENT CODE QUALITY STATE:
-        {state.get('code_issues', [])}
+        {code_issues}
         
         REQUIREMENTS:
         1. Executive Summary: Retain or improve the core mission statement.
@@ -617,67 +688,53 @@ def _generate_enhanced_readme(git_ops: GitOps, state: RepoState) -> str:
         
         Tone: Professional, inviting, and technically accurate.
     """)
+
+def _generate_enhanced_readme(git_ops: GitOps, state: RepoState) -> str:
+    """Uses LLM to rewrite the README based on codebase reality and architecture."""
+    console.print("    [yellow]Mode: AI README Transformation[/yellow]")
     
-    response = llm.invoke([
+    max_chars = cfg.get("scribe.max_artifact_chars", 32_000)
+    current_readme = ""
+    if os.path.exists("README.md"):
+        current_readme = _read_capped("README.md", max_chars)
+            
+    # Gather architectural context from previous nodes
+    arch_context = ""
+    for art in state.get("artifacts", []):
+        if "architecture_overview" in art.get("id", "") or "architecture" in art.get("file_path", ""):
+            try:
+                arch_context += f"\n{_read_capped(art['file_path'], max_chars)}"
+            except Exception:
+                continue
+
+    llm = get_llm("creative")
+    prompt = _README_PROMPT.format(
+        current_readme=current_readme,
+        arch_context=arch_context,
+        code_issues=state.get('code_issues', [])
+    )
+    
+    response_text = cached_invoke(llm, "creative", [
         SystemMessage(content="You are an expert technical documentarian. Output pure markdown only."),
         HumanMessage(content=prompt)
     ])
     
     # Cleaning Logic
-    clean_content = response.content.strip()
-    clean_content = re.sub(r'^```(?:markdown|md)?\n', '', clean_content)
-    clean_content = re.sub(r'\n```$', '', clean_content)
+    clean_content = response_text.strip()
+    clean_content = _MD_FENCE_START.sub('', clean_content)
+    clean_content = _FENCE_END.sub('', clean_content)
     
     return clean_content
     
-def _generate_pr_with_llm(commits_data, source_branch, target_branch, code_issues, artifacts, detailed_commit_docs=""):
-    """
-    Generate comprehensive, production-ready Pull Request documentation.
-    Now includes detailed commit documentation from saved files.
-    """
-    llm = get_llm("creative")
-    
-    # Build commits summary
-    commits_text = "\n".join([
-        f"- `{c['hash']}`: {c['subject']} ({c['author']})" 
-        for c in commits_data
-    ])
-    
-    # Analyze code issues for context
-    issues_section = ""
-    if code_issues:
-        critical = len([i for i in code_issues if i.get("severity") == "critical"])
-        high = len([i for i in code_issues if i.get("severity") == "high"])
-        medium = len([i for i in code_issues if i.get("severity") == "medium"])
-        
-        issues_section = f"""
-Code Quality Context:
-This PR addresses {critical} critical, {high} high, and {medium} medium severity issues detected by automated quality scans.
-"""
-    
-    # Extract file changes for context
-    files_context = ""
-    if artifacts:
-        file_changes = []
-        for art in artifacts:
-            if "file_path" in art:
-                file_changes.append(art["file_path"])
-        if file_changes:
-            files_context = f"\nFiles Modified: {len(file_changes)} files"
+def _read_capped(path: str, max_chars: int) -> str:
+    """Read at most `max_chars` characters so oversized files don't flood the prompt."""
+    with open(path, "r") as f:
+        content = f.read(max_chars + 1)
+    if len(content) > max_chars:
+        return content[:max_chars] + f"\n... [truncated at {max_chars} characters]"
+    return content
 
-    # Include detailed commit documentation
-    commit_docs_section = ""
-    if detailed_commit_docs:
-        commit_docs_section = f"""
-
-DETAILED COMMIT DOCUMENTATION:
-{detailed_commit_docs}
-
-Use the above detailed commit documentation to understand the full context of each change.
-Extract specific technical details, metrics, and implementation approaches from these docs.
-"""
-
-    prompt = textwrap.dedent(f"""
+_PR_PROMPT = textwrap.dedent("""
     You are a Principal Software Engineer writing production-grade Pull Request documentation.
 
     REPOSITORY CONTEXT:
@@ -836,7 +893,7 @@ Extract specific technical details, metrics, and implementation approaches from
 
     ## 11. Contributors
 
-    **Authors:** {', '.join(set([c['author'] for c in commits_data]))}
+    **Authors:** {authors}
 
     ---
 
@@ -854,6 +911,62 @@ Extract specific technical details, metrics, and implementation approaches from
     Don't just summarize commits - provide architectural insights and technical analysis.
     """)
 
+def _generate_pr_with_llm(commits_data, source_branch, target_branch, code_issues, artifacts, detailed_commit_docs=""):
+    """
+    Generate comprehensive, production-ready Pull Request documentation.
+    Now includes detailed commit documentation from saved files.
+    """
+    llm = get_llm("creative")
+    
+    # Build commits summary
+    commits_text = "\n".join([
+        f"- `{c['hash']}`: {c['subject']} ({c['author']})" 
+        for c in commits_data
+    ])
+    
+    # Analyze code issues for context
+    issues_section = ""
+    if code_issues:
+        severity = Counter(i.get("severity") for i in code_issues)
+        critical, high, medium = severity["critical"], severity["high"], severity["medium"]
+        
+        issues_section = f"""
+Code Quality Context:
+This PR addresses {critical} critical, {high} high, and {medium} medium severity issues detected by automated quality scans.
+"""
+    
+    # Extract file changes for context
+    files_context = ""
+    if artifacts:
+        file_changes = []
+        for art in artifacts:
+            if "file_path" in art:
+                file_changes.append(art["file_path"])
+        if file_changes:
+            files_context = f"\nFiles Modified: {len(file_changes)} files"
+
+    # Include detailed commit documentation
+    commit_docs_section = ""
+    if detailed_commit_docs:
+        commit_docs_section = f"""
+
+DETAILED COMMIT DOCUMENTATION:
+{detailed_commit_docs}
+
+Use the above detailed commit documentation to understand the full context of each change.
+Extract specific technical details, metrics, and implementation approaches from these docs.
+"""
+
+    prompt = _PR_PROMPT.format(
+        source_branch=source_branch,
+        target_branch=target_branch,
+        commits_text=commits_text,
+        files_context=files_context,
+        issues_section=issues_section,
+        commit_docs_section=commit_docs_section,
+        authors=', '.join(set([c['author'] for c in commits_data]))
+    )
+
     system_message = SystemMessage(content="""You are a Principal Software Engineer writing production documentation. 
 
 Output MUST be:
@@ -870,31 +983,26 @@ You NEVER:
 
 Begin IMMEDIATELY with document content.""")
 
-    response = llm.invoke([
+    response_text = cached_invoke(llm, "creative", [
         system_message,
         HumanMessage(content=prompt)
     ])
     
     # Advanced content cleaning
-    clean_content = response.content.strip()
+    clean_content = response_text.strip()
     
     # Remove conversational preambles
-    preamble_patterns = [
-        r'^(?:Here\'?s|Here is|I\'?ve created|I\'?ve generated|Below is).*?(?:\n|:)\s*',
-        r'^(?:Let me|I will|I can).*?(?:\n|:)\s*',
-        r'^.*?(?:Pull Request|PR documentation).*?(?:\n|:)\s*'
-    ]
-    for pattern in preamble_patterns:
-        clean_content = re.sub(pattern, '', clean_content, flags=re.IGNORECASE | re.MULTILINE)
+    for pattern in _PREAMBLE_PATTERNS:
+        clean_content = pattern.sub('', clean_content)
     
     # Remove markdown code fences
     if clean_content.startswith('```'):
-        clean_content = re.sub(r'^```(?:markdown|md)?\n', '', clean_content)
-        clean_content = re.sub(r'\n```\s*$', '', clean_content)
+        clean_content = _MD_FENCE_START.sub('', clean_content)
+        clean_content = _FENCE_END_LOOSE.sub('', clean_content)
     
     # Ensure we start with a header
     if not clean_content.startswith('#'):
-        header_match = re.search(r'^#+\s', clean_content, re.MULTILINE)
+        header_match = _FIRST_HEADER.search(clean_content)
         if header_match:
             clean_content = clean_content[header_match.start():]
     
@@ -1,6 +1,7 @@
 """
 Code Steward - Deterministic Code Quality Analysis
 """
+from collections import Counter
 from typing import List, Dict, Any
 from langchain_core.messages import HumanMessage
 
@@ -192,8 +193,8 @@ def steward_node(state: RepoState) -> RepoState:
     }
     
     # Summary
-    critical = len([i for i in issues_found if i.get("severity") == "critical"])
-    warnings = len([i for i in issues_found if i.get("severity") == "warning"])
+    severity = Counter(i.get("severity") for i in issues_found)
+    critical, warnings = severity["critical"], severity["warning"]
     
     print(f"    ✓ Found {len(issues_found)} issues ({critical} critical, {warnings} warnings)")
     print("--- 🛡️  Steward: Analysis Complete ---\n")
@@ -6,13 +6,11 @@ from src.state import RepoState
 from src.tools.gitops import GitOps
 from src.utils.workspace import save_artifact
 from src.utils.config import cfg
-from rich.console import Console
+from src.utils.console import console
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
-console = Console()
-
 def tactician_node(state: RepoState) -> RepoState:
     """
     Handles Git operations intelligently:
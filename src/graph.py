@@ -1,4 +1,6 @@
 # src/graph.py - UPDATED FOR INTEGRATED DOCUMENTATION FLOW
+from typing import List, Union
+
 from langgraph.graph import StateGraph, START, END
 from src.state import RepoState
 from src.agents.architect import architect_node
@@ -17,8 +19,12 @@ workflow.add_node("scribe", scribe_node)
 
 # --- Routing Functions ---
 
-def route_start(state: RepoState) -> str:
-    """Determine first node based on mode"""
+def route_start(state: RepoState) -> Union[str, List[str]]:
+    """
+    Determine first node(s) based on mode.
+    Architect and Steward only read the repository, so the full pipeline
+    fans out to both and LangGraph runs them in the same superstep.
+    """
     mode = state.get("mode", "full")
     
     if mode == "commit":
@@ -32,7 +38,7 @@ def route_start(state: RepoState) -> str:
     elif mode == "pr":
         return "steward"
     else:  # "full"
-        return "architect"
+        return ["architect", "steward"]
 
 def route_steward(state: RepoState) -> str:
     """Determine next node after Steward analysis"""
@@ -66,8 +72,8 @@ workflow.add_conditional_edges(
     }
 )
 
-# Standard flow: Architect -> Steward
-workflow.add_edge("architect", "steward")
+# Standard flow: Architect and Steward run in parallel, then join at Tactician
+workflow.add_edge("architect", "tactician")
 
 # Steward conditional routing
 workflow.add_conditional_edges(
@@ -0,0 +1,67 @@
+"""
+src/tools/git_fast.py - Direct git subprocess calls for hot paths
+
+GitPython's `repo.git.<cmd>` builds every call through Git.execute, which
+converts kwargs, prepares the environment and wraps the process in its own
+object. The read-only commands below run once or more per scribe and commit
+invocation, so they go straight to `git -C <repo>` instead. Anything that
+needs GitPython's object model keeps using GitOps.
+"""
+import subprocess
+from typing import Iterator, List
+
+
+def run_git(repo_path: str, *args: str) -> str:
+    """
+    Run a git command in `repo_path` and return its stdout.
+    Raises subprocess.CalledProcessError on a non-zero exit.
+    """
+    result = subprocess.run(
+        ["git", "-C", repo_path, *args],
+        capture_output=True, encoding="utf-8", errors="replace", check=True
+    )
+    return result.stdout
+
+
+def iter_lines(repo_path: str, *args: str) -> Iterator[str]:
+    """
+    Yield a git command's stdout line by line as git produces it, so callers
+    can start work before a long `git log -p` finishes. Raises
+    subprocess.CalledProcessError on a non-zero exit once output ends.
+    """
+    with subprocess.Popen(
+        ["git", "-C", repo_path, *args],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, encoding="utf-8", errors="replace"
+    ) as proc:
+        for line in proc.stdout:
+            yield line.rstrip("\n")
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, proc.args)
+
+
+def _exit_code(repo_path: str, *args: str) -> int:
+    return subprocess.run(
+        ["git", "-C", repo_path, *args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    ).returncode
+
+
+def ref_exists(repo_path: str, ref: str) -> bool:
+    """True if `ref` resolves to an object, like `git rev-parse --verify`."""
+    return _exit_code(repo_path, "rev-parse", "--verify", "--quiet", ref) == 0
+
+
+def has_staged_changes(repo_path: str) -> bool:
+    """`git diff --cached --quiet` exits 1 when the index differs from HEAD."""
+    return _exit_code(repo_path, "diff", "--cached", "--quiet") != 0
+
+
+def staged_files(repo_path: str) -> List[str]:
+    """Paths with staged changes, relative to the repository root."""
+    output = run_git(repo_path, "diff", "--cached", "--name-only", "-z")
+    return [path for path in output.split("\0") if path]
+
+
+def staged_diff(repo_path: str) -> str:
+    """Patch of the staged changes."""
+    return run_git(repo_path, "diff", "--cached", "--color=never")
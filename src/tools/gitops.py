@@ -1,6 +1,7 @@
 import os
 from typing import List, Optional
-from git import Repo, GitCommandError, InvalidGitRepositoryError, NoSuchPathError
+from git import Repo, GitCmdObjectDB, GitCommandError, InvalidGitRepositoryError, NoSuchPathError
+from src.tools import git_fast
 
 
 class GitOps:
@@ -19,7 +20,9 @@ class GitOps:
         self.repo_path = repo_path
 
         try:
-            self.repo = Repo(repo_path)
+            # Objects are read through the git binary rather than gitdb's
+            # pure-Python pack inflater (explicit, as older GitPython differs)
+            self.repo = Repo(repo_path, odbt=GitCmdObjectDB)
         except (InvalidGitRepositoryError, NoSuchPathError) as e:
             raise ValueError(f"Invalid git repository at '{repo_path}': {e}")
         except Exception as e:
@@ -179,13 +182,31 @@ class GitOps:
         """
         Check if there are staged changes ready to commit.
         Returns True if there are staged changes.
+
+        Uses pygit2 (optional `fast` extra) to compare the index against
+        HEAD in-process; falls back to `git diff --cached --quiet`.
         """
+        staged = self._has_staged_changes_pygit2()
+        if staged is not None:
+            return staged
+
+        # git diff --cached --quiet returns exit code 0 if no changes, 1 if changes
+        return git_fast.has_staged_changes(self.repo.working_dir)
+
+    def _has_staged_changes_pygit2(self) -> Optional[bool]:
+        """Returns None when pygit2 is unavailable or cannot read the repo."""
+        try:
+            import pygit2
+        except ImportError:
+            return None
+
         try:
-            # git diff --cached --quiet returns exit code 0 if no changes, 1 if changes
-            self.repo.git.diff("--cached", "--quiet")
-            return False  # No changes (exit code 0)
+            repo = pygit2.Repository(self.repo.git_dir)
+            if repo.head_is_unborn:
+                return len(repo.index) > 0
+            return len(repo.index.diff_to_tree(repo.head.peel(pygit2.Tree))) > 0
         except Exception:
-            return True  # Has changes (exit code 1 or error)
+            return None
 
 
     def get_staged_diff(self) -> str:
@@ -196,6 +217,6 @@ class GitOps:
         try:
             if not self.has_staged_changes():
                 return ""
-            return self.repo.git.diff("--cached")
+            return git_fast.staged_diff(self.repo.working_dir)
         except Exception as e:
             return ""
\ No newline at end of file
@@ -1,15 +1,99 @@
 """
 src/tools/history.py - Git History Analysis Tool (Enhanced)
 """
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Iterator, Iterable
 from datetime import datetime
 import re
 import os
+import fnmatch
+import mmap
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from git import Repo
 from src.tools.gitops import GitOps
-from rich.console import Console
+from src.tools import git_fast
+from src.utils.config import cfg
+from src.utils.console import console
 
-console = Console()
+IDENTIFIER_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+# `git log` options printing each commit as a NUL-prefixed header plus its patch
+PATCH_LOG_ARGS = ['--format=%x00%H%x1f%an%x1f%ct%x1f%s', '-p', '--no-color', '--no-ext-diff']
+
+# Files larger than this, or with a NUL byte in their first 4 KB, are not searched
+MAX_SEARCH_FILE_BYTES = 2 * 1024 * 1024
+# Generated files that would only add noise to working-tree searches
+GENERATED_FILE_GLOBS = ('*.min.js', '*_pb2.py', '*_pb2_grpc.py')
+# Files read concurrently by a working-tree search
+SEARCH_READ_THREADS = 8
+
+class _FileTextCache:
+    """
+    Text of recently scanned files, keyed on (path, mtime_ns, size) so an
+    edited file is simply read again. Shared by every search in the process,
+    so back-to-back lookups with different patterns read each file once.
+    Lines are split on first use. Least recently used files are dropped past
+    `max_bytes` of source.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        # key -> [text, lines or None]
+        self._entries: "OrderedDict[tuple, list]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def text(self, full_path: str) -> str:
+        return self._entry(full_path)[0]
+
+    def lines(self, full_path: str) -> List[str]:
+        entry = self._entry(full_path)
+        if entry[1] is None:
+            lines = entry[0].split('\n')
+            if lines[-1] == '':
+                lines.pop()  # Text ends with a newline
+            entry[1] = lines
+        return entry[1]
+
+    def _entry(self, full_path: str) -> list:
+        st = os.stat(full_path)
+        key = (full_path, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if st.st_size > MAX_SEARCH_FILE_BYTES:
+            return ['', None]  # Vendored bundles, data dumps
+        text = ''
+        if st.st_size:
+            # Decoded straight from the mapped pages, with no intermediate bytes copy
+            with open(full_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b'\0', 0, 4096) != -1:
+                    return ['', None]  # Binary: decided from the first block alone
+                with memoryview(mm) as view:
+                    text = str(view, 'utf-8', 'ignore')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        entry = [text, None]
+        if st.st_size > self.max_bytes:
+            return entry
+
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]  # Another thread read it meanwhile
+            self._entries[key] = entry
+            self._size += st.st_size
+            while self._size > self.max_bytes:
+                (_, _, size), _ = self._entries.popitem(last=False)
+                self._size -= size
+        return entry
+
+
+_FILE_TEXT = _FileTextCache(max_bytes=32 * 1024 * 1024)
 
 class HistoryAnalyzer:
     """
@@ -19,6 +103,13 @@ class HistoryAnalyzer:
     def __init__(self, git_ops: GitOps):
         self.git_ops = git_ops
         self.repo = git_ops.repo
+        # In-memory results for the current HEAD, see _memoized
+        self._search_cache: Dict[tuple, object] = {}
+        self._search_head: Optional[str] = None
+        # HEAD sha when the working tree was found clean for the current
+        # command, '' if dirty, None if not checked. HistoryCache sets it once
+        # per command so lookups do not each run `git diff` twice.
+        self.clean_head: Optional[str] = None
     
     def track_variable_changes(
         self, 
@@ -30,68 +121,173 @@ class HistoryAnalyzer:
         Track changes to a specific variable across commit history.
         Uses a flexible search to catch assignments, usage, and constants.
         """
-        changes = []
-        # Flexible pattern: matches the variable name as a whole word
-        # This catches 'Z_MIN = 1', 'if x < Z_MIN:', and 'func(Z_MIN)'
-        pattern = rf'\b{re.escape(variable_name)}\b'
-        
+        return list(self.iter_variable_changes(variable_name, file_path, max_commits))
+
+    def iter_variable_changes(
+        self, 
+        variable_name: str, 
+        file_path: Optional[str] = None,
+        max_commits: int = 100,
+        rev: Optional[str] = None,
+        raise_errors: bool = False
+    ) -> Iterator[Dict]:
+        """
+        Yield changes to a variable one at a time, newest commit first,
+        so callers can render results while the history walk continues.
+        `rev` limits the walk to a revision range such as 'abc123..HEAD'.
+        With `raise_errors`, a failed walk raises instead of being reported
+        and cut short, so callers can tell a partial result from a full one.
+        """
         console.print(f"[dim]🔍 Scanning last {max_commits} commits for '{variable_name}'...[/dim]")
+        if file_path:
+            console.print(f"[dim]📁 Filtering by file: {file_path}[/dim]")
         
+        found = 0
         try:
-            # Get commit history for specific file or repo
-            if file_path:
-                commits = list(self.repo.iter_commits(paths=file_path, max_count=max_commits))
-                console.print(f"[dim]📁 Filtering by file: {file_path} ({len(commits)} commits found)[/dim]")
-            else:
-                commits = list(self.repo.iter_commits(max_count=max_commits))
-
-            for commit in commits:
-                try:
-                    # Get the diff for this commit
-                    if commit.parents:
-                        diffs = commit.parents[0].diff(commit, create_patch=True)
-                    else:
-                        diffs = commit.diff(self.repo.tree(), create_patch=True)
-                    
-                    for diff in diffs:
-                        if diff.change_type in ['A', 'M']:
-                            file_path_in_commit = diff.b_path
-                            
-                            # Filter by file path if provided
-                            if file_path and os.path.basename(file_path) not in file_path_in_commit:
-                                continue
-
-                            if diff.diff:
-                                diff_text = diff.diff.decode('utf-8', errors='ignore')
-                                
-                                for line in diff_text.split('\n'):
-                                    # We focus on added lines (+) to track how the value changed/evolved
-                                    if line.startswith('+') and not line.startswith('+++'):
-                                        if re.search(pattern, line):
-                                            # Clean up the line for the 'value' display
-                                            # If it's an assignment, we try to extract the right side
-                                            assignment_match = re.search(rf'{pattern}\s*=\s*(.+)', line)
-                                            display_value = assignment_match.group(1).strip() if assignment_match else line[1:].strip()
-
-                                            changes.append({
-                                                'commit_hash': commit.hexsha[:7],
-                                                'commit_date': datetime.fromtimestamp(commit.committed_date),
-                                                'author': commit.author.name,
-                                                'message': commit.message.split('\n')[0],
-                                                'file': file_path_in_commit,
-                                                'value': display_value,
-                                                'diff_line': line.strip()
-                                            })
-                except Exception as e:
-                    continue # Skip problematic commits
+            for change in self._walk_patches(variable_name, file_path, max_commits, rev):
+                found += 1
+                yield change
             
-            console.print(f"[dim]✅ Found {len(changes)} historical references.[/dim]")
-            return changes
+            console.print(f"[dim]✅ Found {found} historical references.[/dim]")
         
         except Exception as e:
+            if raise_errors:
+                raise
             console.print(f"[red]Error during history analysis: {e}[/red]")
-            return []
+
+    def _walk_patches(
+        self,
+        variable_name: str,
+        file_path: Optional[str],
+        max_commits: int,
+        rev: Optional[str]
+    ) -> Iterator[Dict]:
+        """
+        Stream `git log -p` for the selected commits through _scan_patches.
+
+        Short walks use one `git log` process, so git does the commit
+        selection and diffing in a single pass. Longer ones list the
+        candidate commits first and diff them in batches on a thread pool,
+        one git process per batch, so patches are produced on several cores.
+        Results are still yielded in history order.
+        """
+        workers = cfg.get("history.scan_workers", 4)
+        batch_size = cfg.get("history.scan_batch", 25)
+
+        if workers <= 1 or max_commits <= batch_size:
+            args = self._log_args(variable_name, file_path, max_commits, rev)
+            args[1:1] = PATCH_LOG_ARGS
+            lines = git_fast.iter_lines(self.repo.working_dir, 'log', *args)
+            yield from self._scan_patches(lines, variable_name, file_path)
+            return
+
+        shas = [commit.hexsha for commit in self.select_commits(variable_name, file_path, max_commits, rev)]
+        batches = [shas[i:i + batch_size] for i in range(0, len(shas), batch_size)]
+        path_args = ['--', file_path] if file_path else []
+
+        def scan_batch(batch: List[str]) -> List[Dict]:
+            lines = git_fast.iter_lines(
+                self.repo.working_dir, 'log', '--no-walk=unsorted', *PATCH_LOG_ARGS,
+                *_walk_args(), *_pickaxe_args(variable_name), *batch, *path_args
+            )
+            return list(self._scan_patches(lines, variable_name, file_path))
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches))))
+        try:
+            futures = [executor.submit(scan_batch, batch) for batch in batches]
+            for future in futures:
+                yield from future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _scan_patches(self, lines: Iterable[str], variable_name: str, file_path: Optional[str]) -> Iterator[Dict]:
+        """Yield a change for each added line mentioning `variable_name` in `git log -p` output."""
+        # Flexible pattern: matches the variable name as a whole word
+        # This catches 'Z_MIN = 1', 'if x < Z_MIN:', and 'func(Z_MIN)'
+        pattern = rf'\b{re.escape(variable_name)}\b'
+        # Compiled once per walk; the bound method skips attribute lookups per line
+        search = re.compile(pattern).search
+        assignment_search = re.compile(rf'{pattern}\s*=\s*(.+)').search
+
+        commit = None
+        file_path_in_commit = None
+        in_hunk = False
+        for line in lines:
+            if line.startswith('\x00'):
+                full_hash, author, timestamp, subject = line[1:].split('\x1f', 3)
+                commit = {
+                    'commit_hash': full_hash[:7],
+                    'commit_date': datetime.fromtimestamp(int(timestamp)),
+                    'author': author,
+                    'message': subject
+                }
+                file_path_in_commit = None
+                in_hunk = False
+                continue
+            if line.startswith('diff --git '):
+                file_path_in_commit = None
+                in_hunk = False
+                continue
+            if not in_hunk:
+                # File header: only added or modified files have a b/ side
+                if line.startswith('+++ b/'):
+                    file_path_in_commit = line[6:]
+                    # Filter by file path if provided
+                    if file_path and os.path.basename(file_path) not in file_path_in_commit:
+                        file_path_in_commit = None
+                elif line.startswith('@@'):
+                    in_hunk = True
+                continue
+            if commit is None or file_path_in_commit is None:
+                continue
+
+            # We focus on added lines (+) to track how the value changed/evolved
+            # Plain substring test first: most added lines never mention the name
+            if line.startswith('+') and variable_name in line and search(line):
+                # Clean up the line for the 'value' display
+                # If it's an assignment, we try to extract the right side
+                assignment_match = assignment_search(line)
+                display_value = assignment_match.group(1).strip() if assignment_match else line[1:].strip()
+
+                yield {
+                    **commit,
+                    'file': file_path_in_commit,
+                    'value': display_value,
+                    'diff_line': line.strip()
+                }
     
+    def select_commits(
+        self,
+        variable_name: str,
+        file_path: Optional[str] = None,
+        max_commits: int = 100,
+        rev: Optional[str] = None
+    ) -> List:
+        """
+        Commits a history walk for `variable_name` covers, newest first.
+
+        For a plain identifier, `git log -G<name>` lets git skip every commit
+        whose diff never adds or removes a line containing it, so only
+        candidate commits are diffed. -G is used over -S because -S only
+        sees changes in occurrence count and would miss `X = 1` -> `X = 2`.
+        """
+        args = self._log_args(variable_name, file_path, max_commits, rev)
+        args[1:1] = ['--format=%H']
+        return [self.repo.commit(sha) for sha in self.repo.git.log(*args).split()]
+
+    def _log_args(
+        self,
+        variable_name: str,
+        file_path: Optional[str],
+        max_commits: int,
+        rev: Optional[str]
+    ) -> List[str]:
+        """`git log` arguments selecting the commits to scan; the revision comes first."""
+        args = [rev or 'HEAD', f'--max-count={max_commits}', *_walk_args(), *_pickaxe_args(variable_name)]
+        if file_path:
+            args += ['--', file_path]
+        return args
+
     def get_current_value(self, variable_name: str, file_path: str) -> Optional[str]:
         """
         Get the current state of a variable in a file.
@@ -113,43 +309,261 @@ class HistoryAnalyzer:
             console.print(f"[dim]Could not read current value: {e}[/dim]")
             return None
 
-    def search_files_for_pattern(self, pattern: str, file_extension: str = '.py') -> List[Dict]:
-        """Search all tracked files for a specific pattern with logging."""
-        results = []
+    def search_files_for_pattern(
+        self,
+        pattern: str,
+        file_extension: str = '.py',
+        must_contain: Optional[str] = None,
+        raise_errors: bool = False
+    ) -> List[Dict]:
+        """
+        Search all tracked files for a specific pattern with logging.
+        With `must_contain`, lines lacking that text (case-insensitively) are
+        skipped before the regex runs; it must be implied by the pattern.
+        With `raise_errors`, a failed search raises instead of returning [].
+        """
         try:
-            files = self.repo.git.ls_files(f'*{file_extension}').split('\n')
-            for file_path in files:
-                full_path = os.path.join(self.repo.working_dir, file_path)
-                if not os.path.isfile(full_path): continue
-                
-                with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    for line_num, line in enumerate(f, 1):
-                        if re.search(pattern, line, re.IGNORECASE):
-                            results.append({
-                                'file': file_path,
-                                'line_number': line_num,
-                                'matched_line': line.strip()
-                            })
+            results = self._memoized(
+                ('search_files_for_pattern', pattern, file_extension, must_contain),
+                lambda: self._search_files(pattern, file_extension, must_contain)
+            )
         except Exception as e:
+            if raise_errors:
+                raise
             console.print(f"[red]Search error: {e}[/red]")
+            return []
+        return [dict(result) for result in results]  # Callers may annotate results
+
+    def _search_files(self, pattern: str, file_extension: str, must_contain: Optional[str]) -> List[Dict]:
+        search = re.compile(pattern, re.IGNORECASE).search
+        # Any line match is also a MULTILINE match in the file's text
+        blob_regex = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+        needle = must_contain.lower() if must_contain else None
+        needles = [must_contain] if must_contain else []
+        results = []
+        for file_path, line_num, line in self._iter_tracked_lines(file_extension, blob_regex, needles):
+            if needle and needle not in line.lower():
+                continue
+            if search(line):
+                results.append({
+                    'file': file_path,
+                    'line_number': line_num,
+                    'matched_line': line.strip()
+                })
         return results
 
     def find_function_definition(self, function_name: str) -> List[Dict]:
-        return self.search_files_for_pattern(rf'^\s*def\s+{re.escape(function_name)}\s*\(')
+        return self.search_files_for_pattern(rf'^\s*def\s+{re.escape(function_name)}\s*\(', must_contain=function_name)
 
     def find_class_definition(self, class_name: str) -> List[Dict]:
-        return self.search_files_for_pattern(rf'^\s*class\s+{re.escape(class_name)}\s*[\(:]')
+        return self.search_files_for_pattern(rf'^\s*class\s+{re.escape(class_name)}\s*[\(:]', must_contain=class_name)
+
+    def find_files(self, pattern: str, raise_errors: bool = False) -> List[Dict]:
+        """
+        Find tracked files whose path or base name matches a glob such as
+        'gitops.py' or 'src/tools/*.py'. Results have no line number.
+        With `raise_errors`, a failed listing raises instead of returning [].
+        """
+        results = []
+        try:
+            for file_path in self.repo.git.ls_files().split('\n'):
+                if fnmatch.fnmatch(file_path, pattern) or fnmatch.fnmatch(os.path.basename(file_path), pattern):
+                    results.append({'file': file_path, 'line_number': None, 'matched_line': ''})
+        except Exception as e:
+            if raise_errors:
+                raise
+            console.print(f"[red]Search error: {e}[/red]")
+        return results
+
+    def find_definitions_bulk(
+        self,
+        names: Iterable[str],
+        kinds: Tuple[str, ...] = ('function', 'class'),
+        raise_errors: bool = False
+    ) -> Dict[str, List[Dict]]:
+        """
+        Find function and class definitions for many names in one pass over
+        the tracked files. Returns {name: [result, ...]} where each result
+        also carries a 'kind' of 'function' or 'class'. With `raise_errors`,
+        a failed scan raises instead of returning empty lists.
+        """
+        bulk = {name: [] for name in names}
+        keywords = [kw for kind, kw in (('function', 'def'), ('class', 'class')) if kind in kinds]
+        if not bulk or not keywords:
+            return bulk
+
+        # Lookups are case-insensitive, like find_function_definition
+        by_lower = {}
+        for name in bulk:
+            by_lower.setdefault(name.lower(), []).append(name)
+
+        alternation = '|'.join(re.escape(name) for name in sorted(bulk, key=len, reverse=True))
+        regex = re.compile(rf'^\s*({"|".join(keywords)})\s+({alternation})\s*([\(:])', re.IGNORECASE)
+
+        try:
+            blob_regex = re.compile(regex.pattern, re.IGNORECASE | re.MULTILINE)
+            for file_path, line_num, line in self._iter_tracked_lines('.py', blob_regex, bulk):
+                match = regex.match(line)
+                if not match:
+                    continue
+                keyword, name, opener = match.group(1).lower(), match.group(2), match.group(3)
+                if keyword == 'def' and opener != '(':
+                    continue
+                for requested in by_lower.get(name.lower(), []):
+                    bulk[requested].append({
+                        'file': file_path,
+                        'line_number': line_num,
+                        'matched_line': line.strip(),
+                        'kind': 'function' if keyword == 'def' else 'class'
+                    })
+        except Exception as e:
+            if raise_errors:
+                raise
+            console.print(f"[red]Search error: {e}[/red]")
+        return bulk
+
+    def _iter_tracked_lines(
+        self,
+        file_extension: str = '.py',
+        blob_regex: Optional[re.Pattern] = None,
+        needles: Iterable[str] = ()
+    ) -> Iterator[Tuple[str, int, str]]:
+        """
+        Yield (file_path, line_number, line) for every tracked file with the extension.
+        With `blob_regex` (compiled with MULTILINE), only lines touched by one of
+        its matches in the file's whole text are yielded, so files and lines it
+        cannot match are never split out; see _candidate_lines.
+        With `needles`, only files containing one of them (case-insensitively)
+        are read at all; see _tracked_files.
+        """
+        def scan_one(file_path: str) -> List[Tuple[int, str]]:
+            full_path = os.path.join(self.repo.working_dir, file_path)
+            if not os.path.isfile(full_path): return []
+            if any(fnmatch.fnmatch(os.path.basename(file_path), glob) for glob in GENERATED_FILE_GLOBS): return []
+
+            if blob_regex is not None:
+                return list(_candidate_lines(_FILE_TEXT.text(full_path), blob_regex))
+            return list(enumerate(_FILE_TEXT.lines(full_path), 1))
+
+        # Reads overlap on a small pool (bounding open files); map keeps file order
+        files = self._tracked_files(file_extension, needles)
+        with ThreadPoolExecutor(max_workers=SEARCH_READ_THREADS) as executor:
+            for file_path, lines in zip(files, executor.map(scan_one, files)):
+                for line_num, line in lines:
+                    yield file_path, line_num, line
+
+    def _tracked_files(self, file_extension: str, needles: Iterable[str] = ()) -> List[str]:
+        """
+        Tracked files with the extension. Given literal `needles`, `git grep -l -F`
+        narrows the list to files containing any of them, using git's threaded
+        search instead of opening every file in Python. Binary files are skipped.
+        """
+        needles = [needle for needle in needles if needle]
+        pathspec = f'*{file_extension}'
+        # git's -i only folds ASCII, unlike str.lower
+        if needles and all(needle.isascii() for needle in needles):
+            patterns = [arg for needle in needles for arg in ('-e', needle)]
+            try:
+                output = git_fast.run_git(
+                    self.repo.working_dir, 'grep', '-l', '-z', '-F', '-i', '-I', *patterns, '--', pathspec
+                )
+                return [path for path in output.split('\0') if path]
+            except subprocess.CalledProcessError as e:
+                if e.returncode == 1:
+                    return []  # No file contains any needle
+                # Any other failure: fall back to listing every file
+
+        return [path for path in self.repo.git.ls_files('-z', pathspec).split('\0') if path]
+
+    def _memoized(self, key: tuple, compute):
+        """
+        Return compute() for `key`, remembered until HEAD moves. Nothing is
+        remembered unless `clean_head` says the tree is clean, since a dirty
+        tree's file contents no longer match HEAD.
+        """
+        head = self.clean_head
+        if not head:
+            return compute()
+
+        if head != self._search_head:
+            self._search_cache = {}
+            self._search_head = head
+        if key not in self._search_cache:
+            self._search_cache[key] = compute()
+        return self._search_cache[key]
 
     def get_commit_details(self, commit_hash: str) -> Optional[Dict]:
         try:
             commit = self.repo.commit(commit_hash)
+            # One numstat read against the first parent, as commit.stats does,
+            # instead of re-running that diff on each commit.stats access
+            numstat = git_fast.run_git(
+                self.repo.working_dir, 'show', commit.hexsha, '--numstat', '--no-renames',
+                '--format=', '-m', '--first-parent'
+            )
+            files_changed, insertions, deletions = [], 0, 0
+            for line in numstat.splitlines():
+                if not line:
+                    continue
+                added, removed, path = line.split('\t', 2)
+                files_changed.append(path)
+                insertions += int(added) if added != '-' else 0  # '-' marks binary files
+                deletions += int(removed) if removed != '-' else 0
             return {
                 'hash': commit.hexsha[:7],
                 'message': commit.message,
                 'author': commit.author.name,
                 'date': datetime.fromtimestamp(commit.committed_date),
-                'files_changed': list(commit.stats.files.keys()),
-                'insertions': commit.stats.total['insertions'],
-                'deletions': commit.stats.total['deletions']
+                'files_changed': files_changed,
+                'insertions': insertions,
+                'deletions': deletions
             }
-        except: return None
\ No newline at end of file
+        except: return None
+
+
+def _pickaxe_args(variable_name: str) -> List[str]:
+    """-G lets git drop commits that never touch a line containing a plain identifier."""
+    return [f'-G{variable_name}'] if IDENTIFIER_RE.fullmatch(variable_name) else []
+
+
+
+def _walk_args() -> List[str]:
+    """
+    With history.first_parent (the default), only the mainline is walked and
+    each merge is diffed against its first parent, so a change merged in from
+    a branch is reported once, at the merge, and side branches are skipped.
+    Renames are still detected, since without that a renamed file would
+    report every line it contains as added.
+    """
+    return ['--first-parent', '-m'] if cfg.get("history.first_parent", True) else []
+
+
+def _candidate_lines(text: str, blob_regex: re.Pattern) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (line_number, line) once for each line a match of `blob_regex` in
+    `text` touches. Any single-line match is also a MULTILINE match of the
+    whole text, so this is a superset of the lines a per-line search accepts
+    (patterns anchored with \\A or \\Z aside).
+    Line numbers are counted with str.count between matches rather than by
+    enumerating every line.
+    """
+    line_num = 1
+    line_start = 0
+    last_yielded = 0
+    for match in blob_regex.finditer(text):
+        start, end = match.span()
+        if start == len(text) and text[-1:] in ('', '\n'):
+            break  # Empty match after the final newline is not a line
+        line_num += text.count('\n', line_start, start)
+        line_start = text.rfind('\n', 0, start) + 1
+        while True:
+            line_end = text.find('\n', line_start)
+            if line_end == -1:
+                line_end = len(text)
+            if line_num > last_yielded:
+                yield line_num, text[line_start:line_end]
+                last_yielded = line_num
+            if end <= line_end + 1 or line_end == len(text):
+                break
+            line_num += 1
+            line_start = line_end + 1
@@ -0,0 +1,197 @@
+"""
+src/tools/history_cache.py - Persistent cache for HistoryAnalyzer results
+"""
+import hashlib
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar, Union
+
+from src.tools.history import HistoryAnalyzer
+from src.utils.config import cfg
+from src.utils.console import console
+
+# Part of every key; bump when analyzer results change for the same inputs
+CACHE_VERSION = 3
+
+T = TypeVar("T")
+
+
+class HistoryCache:
+    """
+    Stores analyzer results as JSON under <paths.cache>/history/<repo_hash>/.
+
+    Working-tree searches are keyed by HEAD and only cached while the tree is
+    clean. History walks are keyed by the query alone and remember the HEAD
+    they were computed at, so a later call only walks commits added since.
+    """
+
+    def __init__(self, analyzer: HistoryAnalyzer, refresh: bool = False):
+        self.analyzer = analyzer
+        self.repo = analyzer.repo
+        self.refresh = refresh
+
+        repo_hash = hashlib.sha1(str(self.repo.working_dir).encode("utf-8")).hexdigest()[:16]
+        self.cache_dir = Path(cfg.get("paths.cache")).expanduser() / "history" / repo_hash
+        self._clean_head = None
+        self._clean_head_lock = threading.Lock()
+        # The analyzer may outlive this command; its view of the tree must not
+        self.analyzer.clean_head = None
+
+    # ------------------------------------------------------------------
+    # Working-tree searches
+    # ------------------------------------------------------------------
+
+    def call(self, fn_name: str, *args) -> Union[List[Dict], Dict[str, List[Dict]]]:
+        """
+        Run an analyzer search method through the cache.
+
+        The search raises on failure, so only complete results are stored.
+        A failed search is then run once more uncached, letting the analyzer
+        report the error and return its usual fallback.
+        """
+        method = getattr(self.analyzer, fn_name)
+        try:
+            return self.cached_or_compute(fn_name, args, lambda: method(*args, raise_errors=True))
+        except Exception:
+            return method(*args)
+
+    def cached_or_compute(self, fn_name: str, args: tuple, compute: Callable[[], T]) -> T:
+        """
+        Return the stored result for (HEAD, fn_name, args) or compute and store it.
+        Dirty trees bypass the cache since file contents no longer match HEAD.
+        If compute() raises, nothing is stored and the exception propagates.
+        """
+        head = self._get_clean_head()
+        if not head:
+            return compute()
+
+        key = self._key(head, fn_name, args)
+        if not self.refresh:
+            payload = self._load(key)
+            if payload is not None:
+                return payload["results"]
+
+        results = compute()
+        self._store(key, {"head": head, "results": results})
+        return results
+
+    # ------------------------------------------------------------------
+    # History walks
+    # ------------------------------------------------------------------
+
+    def iter_variable_changes(
+        self,
+        variable_name: str,
+        file_path: Optional[str] = None,
+        max_commits: int = 100
+    ) -> Iterator[Dict]:
+        """
+        Cached counterpart of HistoryAnalyzer.iter_variable_changes.
+
+        When HEAD has moved forward since the last run, only the new commits
+        are scanned; cached changes are then trimmed to the commits that are
+        still inside the `max_commits` window.
+        """
+        head = self._get_head()
+        if not head:
+            yield from self.analyzer.iter_variable_changes(variable_name, file_path, max_commits)
+            return
+
+        # The walk mode changes which commits are reported, so it is part of the key
+        first_parent = cfg.get("history.first_parent", True)
+        key = self._key("iter_variable_changes", variable_name, file_path, max_commits, first_parent)
+        cached = None if self.refresh else self._load(key)
+
+        if cached and cached["head"] == head:
+            yield from (_decode_change(c) for c in cached["changes"])
+            return
+
+        # Walks raise instead of stopping early, so a partial result is never stored
+        fresh = []
+        try:
+            if cached and self._is_ancestor(cached["head"], head):
+                for change in self.analyzer.iter_variable_changes(
+                    variable_name, file_path, max_commits, rev=f"{cached['head']}..{head}", raise_errors=True
+                ):
+                    fresh.append(change)
+                    yield change
+
+                window = self._recent_commits(head, variable_name, file_path, max_commits)
+                previous = [_decode_change(c) for c in cached["changes"] if c["commit_hash"] in window]
+                yield from previous
+                changes = fresh + previous
+            else:
+                for change in self.analyzer.iter_variable_changes(
+                    variable_name, file_path, max_commits, raise_errors=True
+                ):
+                    fresh.append(change)
+                    yield change
+                changes = fresh
+        except Exception as e:
+            console.print(f"[red]Error during history analysis: {e}[/red]")
+            return
+
+        self._store(key, {"head": head, "changes": [_encode_change(c) for c in changes]})
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _get_head(self) -> Optional[str]:
+        try:
+            return self.repo.head.commit.hexsha
+        except ValueError:
+            return None  # Unborn HEAD
+
+    def _get_clean_head(self) -> Optional[str]:
+        # Checked once per command, even when searches fan out over threads,
+        # and shared with the analyzer's in-memory cache
+        with self._clean_head_lock:
+            if self._clean_head is None:
+                head = self._get_head()
+                self._clean_head = head if head and not self.repo.is_dirty() else ""
+                self.analyzer.clean_head = self._clean_head
+        return self._clean_head
+
+    def _is_ancestor(self, ancestor: str, descendant: str) -> bool:
+        try:
+            return self.repo.is_ancestor(ancestor, descendant)
+        except Exception:
+            return False  # Rewritten or garbage-collected history
+
+    def _recent_commits(self, head: str, variable_name: str, file_path: Optional[str], max_commits: int) -> set:
+        # Same commit selection as the analyzer's walk, so the windows line up
+        commits = self.analyzer.select_commits(variable_name, file_path, max_commits, rev=head)
+        return {commit.hexsha[:7] for commit in commits}
+
+    def _key(self, *parts) -> str:
+        parts = (CACHE_VERSION,) + parts
+        return hashlib.sha1("|".join(repr(p) for p in parts).encode("utf-8")).hexdigest()
+
+    def _load(self, key: str) -> Optional[dict]:
+        path = self.cache_dir / f"{key}.json"
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, key: str, payload: dict) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_dir / f"{key}.json", "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+        except OSError:
+            pass  # Caching is best-effort
+
+
+def _encode_change(change: Dict) -> Dict:
+    return {**change, "commit_date": change["commit_date"].isoformat()}
+
+
+def _decode_change(change: Dict) -> Dict:
+    return {**change, "commit_date": datetime.fromisoformat(change["commit_date"])}
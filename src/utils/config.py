@@ -2,10 +2,50 @@
 Docstring for src.utils.config
 Updated for GitMentor branding and workspace pathing.
 """
+import functools
 import yaml
 import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict
+
+# src/utils/config.py -> project root (adjust if directory depth changes)
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@functools.cache
+def _build_defaults() -> Dict[str, Any]:
+    """Internal defaults, built once per process."""
+    return {
+        "project": {
+            "name": "GitMentor",
+            "version": "1.0.0",
+        },
+        "paths": {
+            "workspace": ".gitmentor_workspace",
+            "cache": "~/.cache/gitmentor",
+            "repo_root": os.getcwd(),
+        },
+        "scribe": {
+            "max_pr_commits": 200,
+            "max_context_files": 15,
+            "max_artifact_chars": 32000,
+        },
+        "history": {
+            "scan_workers": 4,
+            "scan_batch": 25,
+            "first_parent": True,
+        },
+        "llm": {
+            "provider": "google",
+            "default": {
+                "model": "gemini-2.0-flash",
+                "temperature": 0.1,
+                "max_tokens": 8192,
+                "top_p": 0.95,
+                "top_k": 64,
+            },
+        },
+    }
 
 
 class Config:
@@ -29,26 +69,7 @@ class Config:
         3. Internal defaults
         """
         # Internal Defaults (safe fallback)
-        self._defaults = {
-            "project": {
-                "name": "GitMentor",
-                "version": "1.0.0",
-            },
-            "paths": {
-                "workspace": ".gitmentor_workspace",
-                "repo_root": os.getcwd(),
-            },
-            "llm": {
-                "provider": "google",
-                "default": {
-                    "model": "gemini-2.0-flash",
-                    "temperature": 0.1,
-                    "max_tokens": 8192,
-                    "top_p": 0.95,
-                    "top_k": 64,
-                },
-            },
-        }
+        self._defaults = _build_defaults()
 
         # Resolve config path
         env_path = os.getenv("CONFIG_PATH")
@@ -57,13 +78,7 @@ class Config:
             config_path = Path(env_path).expanduser().resolve()
         else:
             # Resolve config.yaml relative to project root
-            # src/utils/config.py -> project root
-            config_path = (
-                Path(__file__)
-                .resolve()
-                .parents[2]   # adjust if directory depth changes
-                / "config.yaml"
-            )
+            config_path = _PROJECT_ROOT / "config.yaml"
 
         # Load config
         if not config_path.exists():
@@ -72,6 +87,10 @@ class Config:
             with open(config_path, "r") as f:
                 self._config_data = yaml.safe_load(f) or {}
 
+        # Every dot path, including intermediate sections, resolved once
+        self._flat = _flatten(self._config_data)
+        self._flat_defaults = _flatten(self._defaults)
+
     def get(self, path: str, default: Any = None) -> Any:
         """
         Access config using dot notation.
@@ -80,26 +99,30 @@ class Config:
             cfg.get("llm.provider")
             cfg.get("llm.default.model")
         """
-        keys = path.split(".")
-
         # First try loaded YAML
-        value = self._config_data
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return self._get_default(path, default)
+        value = self._flat.get(path, _MISSING)
+        if value is _MISSING:
+            return self._get_default(path, default)
         return value
 
     def _get_default(self, path: str, final_default: Any) -> Any:
-        keys = path.split(".")
-        value = self._defaults
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return final_default
-        return value
+        return self._flat_defaults.get(path, final_default)
+
+
+_MISSING = object()
+
+
+def _flatten(data: Any, prefix: str = "") -> Dict[str, Any]:
+    """Map each dot path in nested dicts to its value, sections included."""
+    flat = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if not isinstance(key, str):
+                continue  # Unreachable through a dot path
+            path = f"{prefix}{key}"
+            flat[path] = value
+            flat.update(_flatten(value, f"{path}."))
+    return flat
 
 
 # Global singleton instance
@@ -0,0 +1,41 @@
+"""
+src/utils/console.py - Shared Rich console
+"""
+import os
+from typing import Optional
+
+from rich.console import Console
+
+
+def make_console() -> Console:
+    """
+    Build a Console from the environment instead of letting Rich probe the
+    terminal. FORCE_COLOR, COLORTERM and COLUMNS are honoured explicitly,
+    and repr highlighting is off since none of our output benefits from it.
+    """
+    return Console(**_console_options())
+
+
+def reconfigure_console(columns: Optional[int] = None) -> None:
+    """
+    Re-read the environment and sys.stdout into the shared console in place,
+    since every module holds a reference to it. The daemon calls this per
+    forwarded command; `columns` is the caller's terminal width, used when
+    COLUMNS is not set.
+    """
+    console.__init__(**_console_options(columns))
+
+
+def _console_options(columns: Optional[int] = None) -> dict:
+    env_columns = os.environ.get("COLUMNS", "")
+    return dict(
+        force_terminal=True if os.environ.get("FORCE_COLOR") else None,
+        color_system="truecolor" if os.environ.get("COLORTERM") in ("truecolor", "24bit") else "auto",
+        width=int(env_columns) if env_columns.isdigit() else columns,
+        highlight=False,
+        log_time=False,
+    )
+
+
+# One instance shared by the CLI, agents and tools
+console = make_console()
@@ -0,0 +1,257 @@
+"""
+Warm-interpreter daemon for the GitMentor CLI.
+
+`gm daemon` keeps LangGraph, LangChain and Rich imported in one long-lived
+process bound to a Unix socket. Subsequent `gm` invocations forward their
+arguments, working directory and environment to it and stream the rendered
+output back, skipping interpreter and import start-up entirely.
+
+The daemon answers with frames of a one-byte type, a four-byte big-endian
+length and a payload: an empty ACCEPTED frame as soon as it picks up the
+connection, OUTPUT frames carrying UTF-8 text, and a final EXIT frame with
+the command's exit status.
+"""
+import contextlib
+import io
+import json
+import os
+import shutil
+import socket
+import struct
+import sys
+import traceback
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from src.utils.console import reconfigure_console
+
+SOCKET_PATH = Path(os.getenv("GITMENTOR_SOCKET", str(Path.home() / ".gitmentor" / "sock")))
+
+# Seconds a client waits for the daemon to pick up its connection before
+# running the command in-process; the daemon serves one command at a time
+ACCEPT_TIMEOUT = 0.5
+
+ACCEPTED, OUTPUT, EXIT = b"A", b"O", b"X"
+_FRAME_HEADER = struct.Struct(">cI")
+
+
+def is_supported() -> bool:
+    """Unix domain sockets are required for the daemon transport."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def is_running(socket_path: Path = SOCKET_PATH) -> bool:
+    """True if a daemon is listening on the socket, as opposed to a stale file."""
+    if not is_supported() or not socket_path.exists():
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+
+def serve(handler: Callable[[List[str]], None], socket_path: Path = SOCKET_PATH) -> bool:
+    """
+    Accept commands on the socket until a shutdown request arrives.
+
+    Requests are handled one at a time because each one changes the working
+    directory and environment of the process to the caller's. Returns False
+    without serving if another daemon is already listening on the socket.
+    """
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if is_running(socket_path):
+        return False
+    if socket_path.exists():
+        socket_path.unlink()  # Left behind by a daemon that did not shut down cleanly
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen(8)
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    _send_frame(conn, ACCEPTED)
+                except OSError:
+                    continue  # Client gave up waiting and ran in-process
+                request = _read_request(conn)
+                if not request:
+                    continue
+                if request.get("cmd") == "shutdown":
+                    break
+                _handle_request(conn, request, handler)
+    finally:
+        server.close()
+        if socket_path.exists():
+            socket_path.unlink()
+    return True
+
+
+def forward(args: List[str], socket_path: Path = SOCKET_PATH) -> Optional[int]:
+    """
+    Send a command to a running daemon and stream its output to stdout.
+
+    Returns the command's exit status, or None when no daemon is reachable
+    or it is busy with another command, so the caller can run the command
+    in-process instead.
+    """
+    if not is_supported() or not socket_path.exists():
+        return None
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with client:
+        try:
+            client.settimeout(ACCEPT_TIMEOUT)
+            client.connect(str(socket_path))
+            kind, _ = _read_frame(client)
+        except OSError:
+            return None  # No daemon, or it did not pick us up in time
+        if kind != ACCEPTED:
+            return None
+        client.settimeout(None)
+
+        payload = {
+            "cmd": args[0] if args else None,
+            "args": args,
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+            "tty": sys.stdout.isatty(),
+            "columns": shutil.get_terminal_size().columns if sys.stdout.isatty() else None,
+        }
+        client.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+        while True:
+            kind, data = _read_frame(client)
+            if kind == OUTPUT:
+                sys.stdout.buffer.write(data)
+                sys.stdout.flush()
+            elif kind == EXIT:
+                return int(data)
+            else:
+                return 1  # Daemon went away mid-command
+
+
+def shutdown(socket_path: Path = SOCKET_PATH) -> bool:
+    """Ask a running daemon to exit. Returns False if none was running."""
+    if not is_supported() or not socket_path.exists():
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+            client.sendall((json.dumps({"cmd": "shutdown"}) + "\n").encode("utf-8"))
+    except OSError:
+        return False
+    return True
+
+
+def _send_frame(conn: socket.socket, kind: bytes, data: bytes = b"") -> None:
+    conn.sendall(_FRAME_HEADER.pack(kind, len(data)) + data)
+
+
+def _read_frame(conn: socket.socket) -> tuple:
+    """Read one frame as (kind, payload); kind is None once the peer has closed."""
+    header = _recv_exact(conn, _FRAME_HEADER.size)
+    if header is None:
+        return None, b""
+    kind, length = _FRAME_HEADER.unpack(header)
+    data = _recv_exact(conn, length)
+    return (kind, data) if data is not None else (None, b"")
+
+
+def _recv_exact(conn: socket.socket, size: int) -> Optional[bytes]:
+    buffer = b""
+    while len(buffer) < size:
+        chunk = conn.recv(size - len(buffer))
+        if not chunk:
+            return None
+        buffer += chunk
+    return buffer
+
+
+def _read_request(conn: socket.socket) -> dict:
+    """Read one newline-terminated JSON request from the connection."""
+    buffer = b""
+    try:
+        while not buffer.endswith(b"\n"):
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            buffer += chunk
+        return json.loads(buffer.decode("utf-8"))
+    except (OSError, ValueError):
+        return {}  # Probe or abandoned connection
+
+
+class _OutputStream(io.TextIOBase):
+    """Text stream that sends everything written to it as OUTPUT frames."""
+
+    def __init__(self, conn: socket.socket, is_terminal: bool):
+        self._conn = conn
+        self._is_terminal = is_terminal
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        # Rich decides on colour and live rendering from the caller's stdout
+        return self._is_terminal
+
+    def write(self, text: str) -> int:
+        if text:
+            _send_frame(self._conn, OUTPUT, text.encode("utf-8"))
+        return len(text)
+
+
+def _handle_request(conn: socket.socket, request: dict, handler: Callable[[List[str]], None]) -> None:
+    """
+    Run the handler in the caller's directory and environment with output
+    bound to the socket, then send its exit status.
+    """
+    stream = _OutputStream(conn, bool(request.get("tty")))
+    previous_cwd = os.getcwd()
+    previous_env = dict(os.environ)
+    previous_stdin = sys.stdin
+    status = 0
+
+    # No terminal is attached, so interactive prompts fail fast instead of hanging
+    sys.stdin = io.StringIO("")
+    try:
+        with contextlib.redirect_stdout(stream), contextlib.redirect_stderr(stream):
+            try:
+                os.environ.clear()
+                os.environ.update(request.get("env") or previous_env)
+                os.chdir(request.get("cwd") or previous_cwd)
+                reconfigure_console(request.get("columns"))
+                handler(request.get("args") or [])
+            except SystemExit as e:
+                status = _exit_status(e)
+            except Exception:
+                traceback.print_exc()
+                status = 1
+            finally:
+                os.chdir(previous_cwd)
+                os.environ.clear()
+                os.environ.update(previous_env)
+        _send_frame(conn, EXIT, str(status).encode("ascii"))
+    except OSError:
+        pass  # Client disconnected mid-stream
+    finally:
+        sys.stdin = previous_stdin
+        reconfigure_console()
+
+
+def _exit_status(exc: SystemExit) -> int:
+    """The status the interpreter would exit with for `exc`."""
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
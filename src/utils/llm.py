@@ -2,16 +2,21 @@
 Docstring for src.tools.llm
 """
 import os
-from typing import Optional
-from langchain_core.language_models import BaseChatModel
-from langchain_google_genai import ChatGoogleGenerativeAI
-# Import the required safety types
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 from src.utils.config import cfg
 
-def get_llm(profile: str = "default") -> BaseChatModel:
+# Provider SDKs are imported inside get_llm, so commands that never reach
+# an LLM do not pay for loading them
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
+@lru_cache(maxsize=8)
+def get_llm(profile: str = "default") -> "BaseChatModel":
     """
     Factory to get an LLM instance based on configuration profiles.
+    Instances are cached per profile so their HTTP clients and connection
+    pools are reused across calls.
     """
     provider = cfg.get("llm.provider") 
     
@@ -29,6 +34,10 @@ def get_llm(profile: str = "default") -> BaseChatModel:
         if not os.getenv("GOOGLE_API_KEY"):
             raise ValueError("GOOGLE_API_KEY environment variable is missing.")
 
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        # Import the required safety types
+        from google.generativeai.types import HarmCategory, HarmBlockThreshold
+
         return ChatGoogleGenerativeAI(
             model=model_name,
             temperature=temperature,
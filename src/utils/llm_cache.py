@@ -0,0 +1,44 @@
+"""
+src/utils/llm_cache.py - On-disk cache for LLM responses
+"""
+import hashlib
+from pathlib import Path
+from typing import List
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+
+from src.utils.config import cfg
+
+
+def cached_invoke(llm: BaseChatModel, profile: str, messages: List[BaseMessage]) -> str:
+    """
+    Invoke the LLM and return the response text, reusing a stored response
+    when the exact same messages were sent to the same model settings before.
+
+    Responses live under <paths.cache>/llm/ keyed by a SHA-256 of the profile's
+    model and temperature plus every message. Set `llm.cache_responses: false`
+    to always call the model.
+    """
+    if not cfg.get("llm.cache_responses", True):
+        return llm.invoke(messages).content
+
+    model_key = "|".join(str(cfg.get(f"llm.{profile}.{field}", cfg.get(f"llm.default.{field}")))
+                         for field in ("model", "temperature"))
+    payload = "\n".join([cfg.get("llm.provider", ""), model_key] +
+                        [f"{m.type}:{m.content}" for m in messages])
+    key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    path = Path(cfg.get("paths.cache")).expanduser() / "llm" / f"{key}.txt"
+
+    try:
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        pass
+
+    content = llm.invoke(messages).content
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    except OSError:
+        pass  # Caching is best-effort
+    return content
@@ -5,9 +5,7 @@ import re
 import sys
 
 from colorama import Fore, Style, init
-from rich.console import Console
-
-console = Console()
+from src.utils.console import console
 
 
 def add_rule_method(logger):
@@ -0,0 +1,110 @@
+"""
+src/utils/repo_index.py - Shared, cached listing of a repository's files
+"""
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from git.exc import GitCommandError
+
+# Directories never worth descending into, and never listed when untracked
+SKIP_DIRS = {".git", "venv", ".venv", "env", "__pycache__", "node_modules"}
+
+
+class RepoFileIndex:
+    """
+    One file listing per repository, shared by every agent in the process.
+
+    Tracked files come from `git ls-files` and are reused for as long as the
+    git index file is unchanged, which costs one stat per call instead of a
+    git process. Untracked files are listed only when asked for, minus any
+    under SKIP_DIRS. Outside a git repository, or if git fails, it falls back
+    to an os.scandir walk, which is not cached.
+    """
+
+    _instances: Dict[str, "RepoFileIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, repo_path: str) -> "RepoFileIndex":
+        """Return the shared index for `repo_path`, creating it on first use."""
+        key = os.path.abspath(repo_path)
+        with cls._instances_lock:
+            index = cls._instances.get(key)
+            if index is None:
+                index = cls._instances[key] = cls(key)
+            return index
+
+    def __init__(self, repo_path: str):
+        self.repo_path = repo_path
+        self._lock = threading.Lock()
+        # (mtime_ns, size) of the git index file the tracked list was read at
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._tracked: List[str] = []
+
+        try:
+            from git import Repo
+            repo = Repo(repo_path)
+            self._git = repo.git
+            self._index_path = os.path.join(repo.git_dir, "index")
+        except Exception:
+            self._git = None  # Not a git repository (or not its root)
+
+    def files(self, ext: str = ".py", include_untracked: bool = False) -> List[str]:
+        """
+        Repo-relative paths of tracked files ending in `ext`. With
+        `include_untracked`, new files that are not ignored are listed too.
+        """
+        if self._git is None:
+            return [path for path in _walk_files(self.repo_path) if path.endswith(ext)]
+
+        try:
+            with self._lock:
+                paths = list(self._tracked_files())
+            if include_untracked:
+                paths += self._untracked_files()
+        except GitCommandError:
+            return [path for path in _walk_files(self.repo_path) if path.endswith(ext)]
+        return [path for path in paths if path.endswith(ext)]
+
+    def _tracked_files(self) -> List[str]:
+        # Staging, commits, checkouts and resets all rewrite the index
+        try:
+            stat = os.stat(self._index_path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None  # No index yet, so nothing is tracked
+        if stamp is None or stamp != self._stamp:
+            self._tracked = [path for path in self._git.ls_files("-z").split("\0") if path]
+            self._stamp = stamp
+        return self._tracked
+
+    def _untracked_files(self) -> List[str]:
+        output = self._git.ls_files("-z", "--others", "--exclude-standard")
+        return [
+            path for path in output.split("\0")
+            if path and not SKIP_DIRS.intersection(path.split("/")[:-1])
+        ]
+
+
+def _walk_files(root: str) -> Iterator[str]:
+    """
+    Yield root-relative file paths from an explicit os.scandir stack.
+    DirEntry type checks reuse the dirent data, so no extra stat call is
+    made per entry, and ignored directories are pruned before they are opened.
+    """
+    prefix_len = len(os.path.join(root, ""))
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                subdirs = []
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            subdirs.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.path[prefix_len:]
+        except OSError:
+            continue  # Unreadable directory
+        stack.extend(subdirs)
@@ -3,6 +3,7 @@ Utility for managing the GitMentor workspace and artifact persistence.
 Optimized to overwrite existing artifacts to maintain a clean workspace.
 """
 import os
+from functools import lru_cache
 from typing import Optional
 from src.utils.config import cfg
 
@@ -21,8 +22,8 @@ def save_artifact(content: str, extension: str, prefix: Optional[str] = None) ->
     # Ensure we use the latest workspace path from config
     target_dir = cfg.get("paths.workspace", WORKSPACE_DIR)
     
-    if not os.path.exists(target_dir):
-        os.makedirs(target_dir)
+    # exist_ok: parallel agents may create the workspace at the same time
+    os.makedirs(target_dir, exist_ok=True)
     
     if prefix:
         # Example: dependency_graph.mmd
@@ -40,6 +41,17 @@ def save_artifact(content: str, extension: str, prefix: Optional[str] = None) ->
     return filepath
 
 def load_artifact(filepath: str) -> str:
-    """Reads artifact data from disk back into memory."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        return f.read()
\ No newline at end of file
+    """
+    Reads artifact data from disk back into memory.
+    Repeated loads of an unchanged file return the text read the first time.
+    """
+    st = os.stat(filepath)
+    return _load_artifact(filepath, st.st_mtime_ns, st.st_size)
+
+@lru_cache(maxsize=32)
+def _load_artifact(filepath: str, mtime_ns: int, size: int) -> str:
+    # mtime_ns and size are only part of the cache key, so edits miss the cache
+    with open(filepath, "rb") as f:
+        text = f.read().decode("utf-8")
+    # Same newlines text mode would have produced
+    return text.replace("\r\n", "\n").replace("\r", "\n") if "\r" in text else text
\ No newline at end of file